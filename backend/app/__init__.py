@@ -1,10 +1,15 @@
 import os
-from flask import Flask, send_from_directory, g
+from flask import Flask, g
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_cors import CORS
-from app.extensions import db, oauth, init_oauth
-from app.controllers import task_bp, user_bp, auth_bp
+from app.extensions import db, oauth, init_oauth, init_cache
+from app.controllers import task_bp, user_bp, auth_bp, internal_bp, health_bp
+from app.commands import register_commands
 from app.models.user import User
+from app.utils.pool_metrics import InstrumentedQueuePool
+from app.utils.database import check_database
+from app.utils.static_files import StaticManifest
+from app.utils.json_provider import OrjsonProvider
 from config import config
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
@@ -16,6 +21,7 @@ def create_app(config_name='development'):
         config_name = os.environ.get('FLASK_ENV', 'development')
     """Application factory"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Load configurations from the .env file
     load_dotenv()
@@ -39,18 +45,33 @@ def create_app(config_name='development'):
             cursor.execute("PRAGMA foreign_keys=ON")
             cursor.close()
 
+    # Record connection pool waits for /internal/metrics (pooled engines only, not in-memory SQLite)
+    engine_options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS')
+    if engine_options and 'pool_size' in engine_options:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(engine_options, poolclass=InstrumentedQueuePool)
+
     # Initialize extensions
     db.init_app(app)
     init_oauth(app)
+    init_cache(app)
     
     # Register API blueprints FIRST so they take priority over frontend catch-all routes
     app.register_blueprint(task_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(auth_bp)
+    app.register_blueprint(internal_bp)
+    app.register_blueprint(health_bp)
+
+    register_commands(app)
+
+    # Index the built frontend once; requests are served from the in-memory manifest
+    static_manifest = StaticManifest(app.config['FRONTEND_DIR'])
+    app.extensions['static_manifest'] = static_manifest
 
-    BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-    FRONTEND_DIR = os.path.join(BASE_DIR, '..', 'static', 'frontend')
-    print(FRONTEND_DIR)
+    @app.teardown_request
+    def forget_current_user(exc):
+        # g outlives the request when an app context was already pushed (e.g. in tests)
+        g.pop('auth_identity', None)
 
     if app.config.get("TESTING"):
         @app.before_request
@@ -61,18 +82,18 @@ def create_app(config_name='development'):
     @app.route('/')
     def index():
         """Serve the Next.js frontend index"""
-        try:
-            return send_from_directory(FRONTEND_DIR, 'index.html')
-        except FileNotFoundError:
+        entry = static_manifest.get('index.html')
+        if entry is None:
             return {'error': 'Frontend not built'}, 404
+        return static_manifest.send(entry)
         
     @app.route('/signin')
     def signin():
         """Serve the Next.js frontend signin"""
-        try:
-            return send_from_directory(FRONTEND_DIR, 'signin.html')
-        except FileNotFoundError:
+        entry = static_manifest.get('signin.html')
+        if entry is None:
             return {'error': 'Frontend not built'}, 404
+        return static_manifest.send(entry)
 
     @app.route('/<path:path>')
     def serve_frontend(path):
@@ -82,33 +103,21 @@ def create_app(config_name='development'):
         if path.startswith('api/'):
             return {'error': 'Not found'}, 404
         
-        # Serve static files (.js, .css, images, etc.)
-        try:
-            return send_from_directory(FRONTEND_DIR, path)
-        except FileNotFoundError:
-            # Fallback to index.html for client-side routing
-            try:
-                return send_from_directory(FRONTEND_DIR, 'index.html')
-            except FileNotFoundError:
-                return {'error': 'Frontend not found'}, 404
-
-    # Create tables with retry logic
+        # Serve static files (.js, .css, images, etc.), falling back to index.html for client-side routing
+        entry = static_manifest.get(path) or static_manifest.get('index.html')
+        if entry is None:
+            return {'error': 'Frontend not found'}, 404
+        return static_manifest.send(entry)
+
+    # Schema creation is a one-shot `flask init-db`; here only report whether the database is usable
     with app.app_context():
-        import time
-        max_retries = 30
-        for attempt in range(max_retries):
-            try:
-                db.create_all()
-                break
-            except Exception as e:
-                if "already exists" in str(e):
-                    app.logger.info("Tables already exist, skipping creation.")
-                    break
-                if attempt < max_retries - 1:
-                    app.logger.warning(f"Database connection failed (attempt {attempt + 1}/{max_retries}): {e}")
-                    time.sleep(1)
-                else:
-                    app.logger.error(f"Failed to connect to database after {max_retries} attempts")
-                    raise
+        ready, details = check_database()
+        if not ready:
+            app.logger.warning(f"Database not ready: {details}")
+
+    # Only enable in one process (e.g. a single worker), or run `flask sweep-overdue` from cron instead
+    if app.config.get('ROLLOVER_SCHEDULER_ENABLED'):
+        from app.services.rollover_service import start_rollover_scheduler
+        start_rollover_scheduler(app)
 
     return app
@@ -0,0 +1,33 @@
+import click
+from app.services.rollover_service import RolloverService
+from app.utils.database import init_db
+from app.utils.static_files import compress_static
+
+
+def register_commands(app):
+    """Register the app's flask CLI commands"""
+
+    @app.cli.command('init-db')
+    @click.option('--max-attempts', type=int, default=30,
+                  help='Connection attempts, one second apart, before giving up')
+    def init_db_command(max_attempts):
+        """Create missing tables and indexes (run once per deploy)."""
+        init_db(max_attempts=max_attempts)
+        click.echo("Database schema is up to date")
+
+    @app.cli.command('sweep-overdue')
+    @click.option('--chunk-size', type=int, default=None,
+                  help='Users per transaction (default: ROLLOVER_USER_CHUNK)')
+    def sweep_overdue(chunk_size):
+        """Advance overdue task occurrences and reset broken streaks."""
+        totals = RolloverService.sweep_overdue(chunk_size=chunk_size)
+        click.echo(
+            f"Swept {totals['occurrences']} overdue occurrences "
+            f"({totals['tasks']} streaks reset) for {totals['users']} users"
+        )
+
+    @app.cli.command('compress-static')
+    def compress_static_command():
+        """Write precompressed .br/.gz copies of the built frontend."""
+        written = compress_static(app.config['FRONTEND_DIR'])
+        click.echo(f"Wrote {written['br']} .br and {written['gzip']} .gz files")
@@ -3,7 +3,11 @@ from flask import Blueprint
 task_bp = Blueprint('tasks', __name__, url_prefix='/tasks')
 user_bp = Blueprint('users', __name__, url_prefix='/users')
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
+internal_bp = Blueprint('internal', __name__, url_prefix='/internal')
+health_bp = Blueprint('health', __name__)
 
 from .task_controller import *
 from .user_controller import *
 from .auth_controller import *
+from .internal_controller import *
+from .health_controller import *
@@ -1,10 +1,10 @@
 import os
-from flask import redirect, request, jsonify
+from flask import redirect, jsonify, url_for
 from app.controllers import auth_bp
 from app.services.auth_service import AuthService
-from app.services.calendar_service import CalendarService
-from app.services.task_service import TaskService
+from app.services.calendar_export_service import CalendarExportService
 from app.extensions import oauth
+from app.models import CalendarExportJob
 from app.utils.session_manager import create_session, clear_session, get_current_user
 from app.utils.decorators import login_required
 
@@ -62,33 +62,34 @@ def test_login():
 @auth_bp.route("/calendar/export", methods=["POST"])
 @login_required
 def export_to_calendar():
-    """Export all user tasks to Google Calendar"""
+    """Queue an export of all user tasks to Google Calendar"""
     try:
         user = get_current_user()
+        job = CalendarExportService.enqueue_export(user.id)
         
-        # Get user's tasks grouped by date
-        tasks_by_date = TaskService.get_user_tasks(user.id)
-        
-        if not tasks_by_date:
-            return jsonify({
-                "message": "No tasks to export",
-                "success": 0,
-                "failed": 0
-            }), 200
-        
-        # Sync to calendar (deletes old events, creates new ones)
-        result = CalendarService.export_all_tasks_to_calendar(user, tasks_by_date)
-        
+        status_url = url_for("auth.get_export_status", job_id=job.id)
         return jsonify({
-            "message": f"Synced {result['success']} tasks to calendar (deleted {result['deleted']} old events)",
-            "deleted": result['deleted'],
-            "success": result['success'],
-            "failed": result['failed'],
-            "errors": result['errors'],
-            "event_ids": result['event_ids']
-        }), 200
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": status_url
+        }), 202, {"Location": status_url}
         
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
+
+
+@auth_bp.route("/calendar/export/<job_id>", methods=["GET"])
+@login_required
+def get_export_status(job_id):
+    """Get the status of a calendar export job"""
+    job = CalendarExportService.get_job(get_current_user().id, job_id)
+    if not job:
+        return jsonify({"error": "Export job not found"}), 404
+    
+    response = {"job_id": job.id, "status": job.status}
+    if job.status == CalendarExportJob.SUCCEEDED:
+        response.update(job.result or {})
+    elif job.status == CalendarExportJob.FAILED:
+        response["error"] = job.error
+    
+    return jsonify(response), 200
@@ -0,0 +1,15 @@
+from app.controllers import health_bp
+from app.utils.database import check_database
+
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the worker is up and serving requests"""
+    return {"status": "ok"}, 200
+
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: the database answers and its schema has been created"""
+    ready, details = check_database()
+    return {"status": "ready" if ready else "not ready", **details}, 200 if ready else 503
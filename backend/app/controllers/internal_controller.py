@@ -0,0 +1,24 @@
+from flask import current_app
+from app.controllers import internal_bp
+from app.extensions import db
+from app.utils.decorators import internal_token_required
+
+
+@internal_bp.route('metrics', methods=['GET'])
+@internal_token_required
+def get_metrics():
+    """Get this process' connection pool and cache metrics"""
+    pool = db.engine.pool
+    if hasattr(pool, 'status_dict'):
+        pool_metrics = pool.status_dict()
+    else:
+        pool_metrics = {'status': pool.status()}
+    pool_metrics['class'] = type(pool).__name__
+
+    return {
+        "pool": pool_metrics,
+        "caches": {
+            name: current_app.extensions[name].stats.as_dict()
+            for name in ('task_cache', 'identity_cache')
+        }
+    }, 200
@@ -1,11 +1,42 @@
-from flask import request
+import hashlib
+from datetime import datetime, timedelta
+from flask import request, make_response
 from app.controllers import task_bp
 from app.services.task_service import TaskService
-from app.schemas import task_schema
+from app.schemas import task_serializer, task_summary_serializer
 from app.utils.decorators import login_required
 from app.utils.session_manager import get_current_user
 
 
+def _parse_date_arg(name):
+    """Parse an optional YYYY-MM-DD query parameter into a datetime at midnight"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
+
+def _parse_history_cursor(value):
+    """Parse a completion history cursor ('<completed_at ISO>,<id>')"""
+    try:
+        completed_at, completion_id = value.rsplit(',', 1)
+        return datetime.fromisoformat(completed_at), int(completion_id)
+    except ValueError:
+        raise ValueError("before must be a cursor returned as next_cursor")
+
+
+def _tasks_etag(user_id, version):
+    """Strong ETag for a user's task list at VERSION, distinct per query string"""
+    etag = f"tasks-{user_id}-{version}"
+    if request.args:
+        args = '&'.join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+        etag += '-' + hashlib.sha1(args.encode('utf-8')).hexdigest()[:12]
+    return etag
+
+
 @task_bp.route('', methods=['POST'])
 @login_required
 def create_task():
@@ -19,7 +50,20 @@ def create_task():
             frequency=data.get('frequency'),
             category=data.get('category')
         )
-        return task_schema.dump(task), 201
+        return task_serializer.dump(task), 201
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+@task_bp.route('bulk', methods=['POST'])
+@login_required
+def create_tasks_bulk():
+    """Create many tasks at once"""
+    try:
+        data = request.get_json()
+        task_ids = TaskService.create_tasks(get_current_user().id, data.get('tasks'))
+        return {"ids": task_ids}, 201
     except ValueError as e:
         return {"error": str(e)}, 400
     except Exception as e:
@@ -37,7 +81,7 @@ def update_task_title(task_id):
         
         task = TaskService.update_task_name(get_current_user().id, task_id, new_title)
         if task:
-            return task_schema.dump(task), 200
+            return task_serializer.dump(task), 200
         return {"error": "Task not found"}, 404
     except Exception as e:
         return {"error": str(e)}, 400
@@ -45,10 +89,36 @@ def update_task_title(task_id):
 @task_bp.route('', methods=['GET'])
 @login_required
 def get_tasks():
-    """Get all tasks for a user, grouped by due date"""
+    """Get all tasks for a user, grouped by due date
+    
+    Optional query parameters:
+        from: Only include occurrences due on or after this date (YYYY-MM-DD)
+        to: Only include occurrences due on or before this date (YYYY-MM-DD)
+        limit: Maximum number of occurrences to return
+    """
+    try:
+        start = _parse_date_arg('from')
+        end = _parse_date_arg('to')
+        limit = request.args.get('limit', type=int)
+        if end is not None:
+            end += timedelta(days=1)  # 'to' is inclusive
+        if limit is not None and limit < 1:
+            return {"error": "limit must be a positive integer"}, 400
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    
     try:
         user = get_current_user()
-        grouped_tasks = TaskService.get_user_tasks(user.id)
+        
+        # The task list only changes through TaskService writes, which bump the version
+        version = TaskService.get_tasks_version(user.id)
+        etag = _tasks_etag(user.id, version)
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+        
+        grouped_tasks = TaskService.get_user_tasks(user.id, start=start, end=end, limit=limit, version=version)
         
         # Convert to JSON-serializable format
         result = {}
@@ -62,7 +132,95 @@ def get_tasks():
                 for occ in occurrences
             ]
         
-        return result, 200
+        response = make_response(result, 200)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+
+@task_bp.route('summary', methods=['GET'])
+@login_required
+def get_task_summary():
+    """Get the current user's dashboard counts"""
+    try:
+        summary = TaskService.get_summary(get_current_user().id)
+        return task_summary_serializer.dump(summary), 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+
+@task_bp.route('<int:task_id>/history', methods=['GET'])
+@login_required
+def get_task_history(task_id):
+    """Get a task's completions, newest first
+    
+    Optional query parameters:
+        before: Cursor of the page to get (the previous page's next_cursor)
+        limit: Page size (default 50, at most 200)
+    """
+    try:
+        before = request.args.get('before')
+        before = _parse_history_cursor(before) if before else None
+        limit = request.args.get('limit', type=int)
+        if limit is not None and not 1 <= limit <= TaskService.HISTORY_MAX_PAGE_SIZE:
+            return {"error": f"limit must be between 1 and {TaskService.HISTORY_MAX_PAGE_SIZE}"}, 400
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    
+    try:
+        page = TaskService.get_completion_history(get_current_user().id, task_id, before=before, limit=limit)
+        if page is None:
+            return {"error": "Task not found"}, 404
+        
+        completions, next_cursor = page
+        return {
+            "task_id": task_id,
+            "completions": [
+                {"id": completion_id, "completed_at": completed_at.isoformat()}
+                for completion_id, completed_at in completions
+            ],
+            "next_cursor": f"{next_cursor[0].isoformat()},{next_cursor[1]}" if next_cursor else None
+        }, 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+
+@task_bp.route('stats', methods=['GET'])
+@login_required
+def get_task_stats():
+    """Get the current user's completion counts per day or week
+    
+    Optional query parameters:
+        from: First day counted (YYYY-MM-DD, default 29 days before 'to')
+        to: Last day counted, inclusive (YYYY-MM-DD, default today)
+        group: 'day' (default) or 'week'
+        task_id: Only count completions of this task
+    """
+    try:
+        end = _parse_date_arg('to') or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start = _parse_date_arg('from') or end - timedelta(days=29)
+        if start > end:
+            return {"error": "from must not be after to"}, 400
+        group = request.args.get('group', 'day')
+        task_id = request.args.get('task_id', type=int)
+        
+        periods = TaskService.get_completion_stats(
+            get_current_user().id, start, end + timedelta(days=1), group=group, task_id=task_id
+        )
+        return {
+            "from": start.date().isoformat(),
+            "to": end.date().isoformat(),
+            "group": group,
+            "total": sum(count for _, count in periods),
+            "periods": [
+                {"start": period.isoformat(), "completions": count}
+                for period, count in periods
+            ]
+        }, 200
+    except ValueError as e:
+        return {"error": str(e)}, 400
     except Exception as e:
         return {"error": str(e)}, 400
 
@@ -82,11 +240,67 @@ def delete_task(task_id):
 @task_bp.route('<int:occurrence_id>/complete', methods=['POST'])
 @login_required
 def complete_task(occurrence_id):
-    """Mark a task as completed"""
+    """Mark a task as completed
+    
+    Optional JSON body:
+        next_due_at: The occurrence's next_due_at from GET /tasks; if it has
+            moved on since (already completed), responds 409 instead
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        expected_due_at = data.get('next_due_at')
+        if expected_due_at is not None:
+            expected_due_at = datetime.fromisoformat(expected_due_at)
+    except (TypeError, ValueError):
+        return {"error": "next_due_at must be an ISO datetime"}, 400
+    
     try:
-        completion = TaskService.complete_task(get_current_user().id, occurrence_id)
+        completion = TaskService.complete_task(get_current_user().id, occurrence_id, expected_due_at)
         if completion:
             return {"message": "Task marked as completed"}, 200
         return {"error": "Task not found"}, 404
+    except ValueError as e:
+        return {"error": str(e)}, 409
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+
+@task_bp.route('complete', methods=['POST'])
+@login_required
+def complete_tasks_bulk():
+    """Mark many task occurrences as completed at once
+    
+    JSON body:
+        ids: List of occurrence IDs, or of {"id", "next_due_at"} objects; an
+            occurrence whose next_due_at has moved on since is reported as
+            conflict instead of being completed again
+    """
+    try:
+        data = request.get_json()
+        items = data.get('ids')
+        occurrence_ids, expected_due_dates = items, {}
+        if isinstance(items, list):
+            occurrence_ids = []
+            for item in items:
+                if isinstance(item, dict):
+                    occurrence_id = item.get('id')
+                    if item.get('next_due_at') is not None:
+                        expected_due_dates.setdefault(occurrence_id, datetime.fromisoformat(item['next_due_at']))
+                    item = occurrence_id
+                occurrence_ids.append(item)
+    except (TypeError, ValueError):
+        return {"error": "next_due_at must be an ISO datetime"}, 400
+    except Exception as e:
+        return {"error": str(e)}, 400
+    
+    try:
+        results = TaskService.complete_tasks(get_current_user().id, occurrence_ids, expected_due_dates)
+        for result in results:
+            if 'next_due_at' in result:
+                result['next_due_at'] = result['next_due_at'].isoformat()
+        completed = sum(1 for result in results if result['status'] == TaskService.COMPLETED)
+        return {"completed": completed, "results": results}, 200
+    except ValueError as e:
+        return {"error": str(e)}, 400
     except Exception as e:
         return {"error": str(e)}, 400
@@ -1,7 +1,7 @@
-from flask import request, jsonify, session
+from flask import current_app, request, session, Response, stream_with_context
 from app.controllers import user_bp
 from app.services.user_service import UserService
-from app.schemas import user_schema
+from app.schemas import user_serializer
 
 
 @user_bp.route('/current', methods=['GET'])
@@ -14,7 +14,7 @@ def get_current_user():
         
         user = UserService.get_user(user_id)
         if user:
-            return user_schema.dump(user), 200
+            return user_serializer.dump(user), 200
         return {"error": "User not found"}, 404
     except Exception as e:
         return {"error": str(e)}, 400
@@ -32,7 +32,7 @@ def create_user():
             return {"error": "email is required"}, 400
         
         user = UserService.create_user(email=email, name=name)
-        return user_schema.dump(user), 201
+        return user_serializer.dump(user), 201
     except ValueError as e:
         return {"error": str(e)}, 409
     except Exception as e:
@@ -45,7 +45,7 @@ def get_user(user_id):
     try:
         user = UserService.get_user(user_id)
         if user:
-            return user_schema.dump(user), 200
+            return user_serializer.dump(user), 200
         return {"error": "User not found"}, 404
     except Exception as e:
         return {"error": str(e)}, 400
@@ -53,14 +53,45 @@ def get_user(user_id):
 
 @user_bp.route('', methods=['GET'])
 def get_all_users():
-    """Get all users"""
+    """Get users, a page at a time
+    
+    Optional query parameters:
+        after_id: Only return users with a greater ID (the previous page's next_after_id)
+        limit: Page size (default 100, at most 500)
+        stream: If true, stream every user after after_id as one JSON document
+    """
     try:
-        users = UserService.get_all_users()
-        return {"users": [user_schema.dump(u) for u in users]}, 200
+        after_id = request.args.get('after_id', type=int)
+        limit = request.args.get('limit', type=int)
+        if limit is not None and not 1 <= limit <= UserService.USERS_MAX_PAGE_SIZE:
+            return {"error": f"limit must be between 1 and {UserService.USERS_MAX_PAGE_SIZE}"}, 400
+        
+        if request.args.get('stream', 'false').lower() == 'true':
+            return Response(
+                stream_with_context(_stream_users(after_id, limit)),
+                mimetype='application/json'
+            )
+        
+        users, next_after_id = UserService.get_users_page(after_id, limit)
+        return {
+            "users": user_serializer.dump_many(users),
+            "next_after_id": next_after_id
+        }, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
 
+def _stream_users(after_id, batch_size):
+    """Generate {"users": [...]} one keyset batch at a time"""
+    yield '{"users": ['
+    separator = ''
+    for users in UserService.iter_users(after_id, batch_size):
+        # Encode the whole batch in one call and drop its enclosing brackets
+        yield separator + current_app.json.dumps(user_serializer.dump_many(users))[1:-1]
+        separator = ','
+    yield ']}'
+
+
 @user_bp.route('<int:user_id>', methods=['PUT'])
 def update_user(user_id):
     """Update user data"""
@@ -68,7 +99,7 @@ def update_user(user_id):
         data = request.get_json()
         user = UserService.update_user(user_id, **data)
         if user:
-            return user_schema.dump(user), 200
+            return user_serializer.dump(user), 200
         return {"error": "User not found"}, 404
     except ValueError as e:
         return {"error": str(e)}, 409
@@ -1,6 +1,8 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from authlib.integrations.flask_client import OAuth
+from app.utils.cache import create_cache, LRUCache
 
 db = SQLAlchemy()
 
@@ -16,4 +18,18 @@ def init_oauth(app):
         client_kwargs={
             'scope': 'openid email profile https://www.googleapis.com/auth/calendar'
         }
-    )
\ No newline at end of file
+    )
+
+
+def init_cache(app):
+    app.extensions['task_cache'] = create_cache(app.config)
+    # Per-process only: entries expire quickly instead of being invalidated across workers
+    app.extensions['identity_cache'] = LRUCache(
+        max_entries=app.config.get('AUTH_CACHE_MAX_ENTRIES', 4096),
+        ttl=app.config.get('AUTH_CACHE_TTL', 30)
+    )
+
+
+def get_task_cache():
+    """Get the task list cache of the current app"""
+    return current_app.extensions['task_cache']
@@ -1,4 +1,5 @@
-from .user import User
-from .task import Task, TaskCompletion, TaskOccurrences
+from .user import User, AuthTokenVersion
+from .task import Task, TaskCompletion, TaskOccurrences, TaskListVersion, TaskSummary
+from .calendar_export_job import CalendarExportJob
 
-__all__ = ['User', 'Task', 'TaskCompletion', 'TaskOccurrences']
+__all__ = ['User', 'AuthTokenVersion', 'Task', 'TaskCompletion', 'TaskOccurrences', 'TaskListVersion', 'TaskSummary', 'CalendarExportJob']
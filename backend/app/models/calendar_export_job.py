@@ -0,0 +1,44 @@
+from app.extensions import db
+
+
+class CalendarExportJob(db.Model):
+    __tablename__ = "calendar_export_jobs"
+
+    # Status values
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    id = db.Column(db.String(32), primary_key=True)
+
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        nullable=False,
+    )
+
+    status = db.Column(db.String(20), nullable=False, default=QUEUED)
+
+    # Export summary once the job has finished successfully
+    result = db.Column(db.JSON, nullable=True)
+
+    error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=db.func.now(),
+    )
+
+    # Refreshed while the job runs; a job is timed out on the last heartbeat
+    # (or, while still queued, on created_at)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    # relationships
+    user = db.relationship("User", back_populates="export_jobs")
+
+    def __repr__(self):
+        return f"<CalendarExportJob id={self.id} user_id={self.user_id} status={self.status}>"
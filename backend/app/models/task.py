@@ -4,6 +4,9 @@ from datetime import datetime
 
 class Task(db.Model):
     __tablename__ = "tasks"
+    __table_args__ = (
+        db.Index("ix_tasks_user_id", "user_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -49,6 +52,10 @@ class Task(db.Model):
 
 class TaskOccurrences(db.Model):
     __tablename__ = "task_occurrences"
+    __table_args__ = (
+        # Serves both "occurrences of a task" and "earliest occurrence of a task"
+        db.Index("ix_task_occurrences_task_id_next_due_at", "task_id", "next_due_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -71,6 +78,9 @@ class TaskOccurrences(db.Model):
 
 class TaskCompletion(db.Model):
     __tablename__ = "task_completions"
+    __table_args__ = (
+        db.Index("ix_task_completions_task_id_completed_at", "task_id", "completed_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -80,10 +90,13 @@ class TaskCompletion(db.Model):
         nullable=False,
     )
 
+    # Set in Python rather than by the database clock: SQLite's CURRENT_TIMESTAMP
+    # has no microseconds, and the history cursor compares against values in
+    # SQLAlchemy's 'YYYY-MM-DD HH:MM:SS.ffffff' format
     completed_at = db.Column(
         db.DateTime,
         nullable=False,
-        default=db.func.now(),
+        default=datetime.now,
     )
 
     # relationships
@@ -91,3 +104,52 @@ class TaskCompletion(db.Model):
 
     def __repr__(self):
         return f"<TaskCompletion id={self.id} task_id={self.task_id} at={self.completed_at}>"
+
+
+class TaskListVersion(db.Model):
+    """Per-user counter bumped whenever the user's task list changes (used as the GET /tasks ETag)"""
+    __tablename__ = "task_list_versions"
+
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        primary_key=True,
+    )
+
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    # relationships
+    user = db.relationship("User", back_populates="task_list_version")
+
+    def __repr__(self):
+        return f"<TaskListVersion user_id={self.user_id} version={self.version}>"
+
+
+class TaskSummary(db.Model):
+    """Per-user dashboard counts, computed by TaskService on first read and deleted whenever the user's tasks change.
+    Counts that depend on the date are valid for AS_OF only."""
+    __tablename__ = "task_summaries"
+
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        primary_key=True,
+    )
+
+    as_of = db.Column(db.Date, nullable=False)
+
+    total_tasks = db.Column(db.Integer, nullable=False, default=0)
+
+    due_today = db.Column(db.Integer, nullable=False, default=0)
+
+    overdue = db.Column(db.Integer, nullable=False, default=0)
+
+    best_streak = db.Column(db.Integer, nullable=False, default=0)
+
+    completions_this_week = db.Column(db.Integer, nullable=False, default=0)
+
+    # relationships
+    user = db.relationship("User", back_populates="task_summary")
+
+    def __repr__(self):
+        return f"<TaskSummary user_id={self.user_id} as_of={self.as_of}>"
@@ -25,6 +25,26 @@ class User(db.Model):
         cascade="all, delete-orphan"
     )
 
+    export_jobs = db.relationship(
+        "CalendarExportJob",
+        back_populates="user",
+        cascade="all, delete-orphan"
+    )
+
+    task_list_version = db.relationship(
+        "TaskListVersion",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
+
+    task_summary = db.relationship(
+        "TaskSummary",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
+
     def is_token_expired(self):
         """Check if the access token is expired"""
         if not self.token_expiry:
@@ -32,3 +52,13 @@ class User(db.Model):
         return datetime.now() >= self.token_expiry
 
 
+class AuthTokenVersion(db.Model):
+    """Per-user version embedded in signed session tokens; bumping it revokes them.
+    Not tied to users by a foreign key so the bump survives deleting the user."""
+    __tablename__ = "auth_token_versions"
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AuthTokenVersion user_id={self.user_id} version={self.version}>"
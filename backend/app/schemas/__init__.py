@@ -1,5 +1,6 @@
 from .user import UserSchema
-from .task import TaskSchema, TaskCompletionSchema, TaskOccurrencesSchema
+from .task import TaskSchema, TaskCompletionSchema, TaskOccurrencesSchema, TaskSummarySchema
+from .serializers import FastSerializer
 
 # Single / many schema instances
 user_schema = UserSchema()
@@ -9,12 +10,20 @@ completion_schema = TaskCompletionSchema()
 completions_schema = TaskCompletionSchema(many=True)
 occurrence_schema = TaskOccurrencesSchema()
 occurrences_schema = TaskOccurrencesSchema(many=True)
+task_summary_schema = TaskSummarySchema()
+
+# Precompiled dump-only serializers for the hot controller paths
+user_serializer = FastSerializer(user_schema)
+task_serializer = FastSerializer(task_schema)
+task_summary_serializer = FastSerializer(task_summary_schema)
 
 __all__ = [
     'UserSchema',
     'TaskSchema',
     'TaskCompletionSchema',
     'TaskOccurrencesSchema',
+    'TaskSummarySchema',
+    'FastSerializer',
     'user_schema',
     'task_schema',
     'tasks_schema',
@@ -22,4 +31,8 @@ __all__ = [
     'completions_schemas',
     'occurrence_schema',
     'occurrences_schema',
+    'task_summary_schema',
+    'user_serializer',
+    'task_serializer',
+    'task_summary_serializer',
 ]
@@ -1,5 +1,5 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema, auto_field
-from app.models import Task, TaskCompletion, TaskOccurrences
+from app.models import Task, TaskCompletion, TaskOccurrences, TaskSummary
 from app.extensions import db
 
 
@@ -33,4 +33,11 @@ class TaskSchema(SQLAlchemyAutoSchema):
         include_fk = True  # include user_id
 
     # If you want nested completions in the task JSON, uncomment this:
-    # completions = fields.Nested(TaskCompletionSchema, many=True)
\ No newline at end of file
+    # completions = fields.Nested(TaskCompletionSchema, many=True)
+
+
+class TaskSummarySchema(SQLAlchemyAutoSchema):
+    class Meta:
+        model = TaskSummary
+        sqla_session = db.session
+        load_instance = True
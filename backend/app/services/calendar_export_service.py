@@ -0,0 +1,251 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, update
+from app.extensions import db
+from app.models import User, CalendarExportJob
+from app.services.task_service import TaskService
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    """Get the process-wide thread pool that runs export jobs"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='calendar-export'
+            )
+        return _executor
+
+
+def _run_in_app_context(app, job_id):
+    with app.app_context():
+        try:
+            CalendarExportService.run_export(job_id)
+        finally:
+            db.session.remove()
+
+
+@contextmanager
+def _heartbeat(app, job_id, interval):
+    """Refresh a running job's heartbeat_at every interval seconds until the block exits
+
+    Beats from its own thread and session, so a slow Google call (or the
+    export's own transaction) never holds it up.
+    """
+    stopped = threading.Event()
+
+    def beat():
+        with app.app_context():
+            try:
+                while not stopped.wait(interval):
+                    try:
+                        db.session.execute(
+                            update(CalendarExportJob)
+                            .where(
+                                CalendarExportJob.id == job_id,
+                                CalendarExportJob.status == CalendarExportJob.RUNNING
+                            )
+                            .values(heartbeat_at=datetime.now())
+                        )
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        app.logger.warning(f"Calendar export {job_id} heartbeat failed: {e}")
+            finally:
+                db.session.remove()
+
+    thread = threading.Thread(target=beat, name='calendar-export-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+class CalendarExportService:
+    """Runs Google Calendar exports as background jobs.
+
+    Job state lives in the database so any gunicorn worker can answer a
+    status poll, while the export itself runs on a small thread pool in
+    the worker that accepted the request.
+    """
+
+    ACTIVE_STATUSES = (CalendarExportJob.QUEUED, CalendarExportJob.RUNNING)
+
+    @staticmethod
+    def _expire_stale_jobs(user_id):
+        """Mark the user's unfinished jobs that missed the export timeout as failed
+
+        A job whose worker was restarted (e.g. by gunicorn's max_requests)
+        would otherwise stay queued or running forever. Running jobs are
+        judged on their heartbeat, so a slow export that is still alive is
+        never expired; a queued job that is expired can no longer start.
+        """
+        now = datetime.now()
+        cutoff = now - timedelta(seconds=current_app.config['CALENDAR_EXPORT_TIMEOUT_SECONDS'])
+        db.session.execute(
+            update(CalendarExportJob)
+            .where(
+                CalendarExportJob.user_id == user_id,
+                CalendarExportJob.status.in_(CalendarExportService.ACTIVE_STATUSES),
+                func.coalesce(CalendarExportJob.heartbeat_at, CalendarExportJob.created_at) < cutoff
+            )
+            .values(status=CalendarExportJob.FAILED, error="Export timed out", finished_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def enqueue_export(user_id):
+        """Create an export job for the user and schedule it
+
+        Only one export per user runs at a time: two syncs at once would both
+        insert the same new events into Google.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            CalendarExportJob: The queued job, or the user's export that is
+            already queued or running
+        """
+        # Lock the user's row so concurrent requests (a double click) see each other's job
+        db.session.query(User.id).filter_by(id=user_id).with_for_update().first()
+        CalendarExportService._expire_stale_jobs(user_id)
+        active = CalendarExportJob.query.filter(
+            CalendarExportJob.user_id == user_id,
+            CalendarExportJob.status.in_(CalendarExportService.ACTIVE_STATUSES)
+        ).order_by(CalendarExportJob.created_at.desc()).first()
+        if active is not None:
+            db.session.commit()
+            return active
+
+        job = CalendarExportJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            status=CalendarExportJob.QUEUED,
+            # Set here, not by the database clock, so the timeout compares like with like
+            created_at=datetime.now(),
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        app = current_app._get_current_object()
+        if app.config.get('CALENDAR_EXPORT_INLINE'):
+            # Run synchronously (used by the test suite)
+            CalendarExportService.run_export(job.id)
+        else:
+            executor = _get_executor(app.config.get('CALENDAR_EXPORT_WORKERS', 2))
+            executor.submit(_run_in_app_context, app, job.id)
+
+        return job
+
+    @staticmethod
+    def get_job(user_id, job_id):
+        """Get an export job owned by the user"""
+        job = db.session.get(CalendarExportJob, job_id)
+        if not job or job.user_id != user_id:
+            return None
+
+        timeout = timedelta(seconds=current_app.config['CALENDAR_EXPORT_TIMEOUT_SECONDS'])
+        last_seen = job.heartbeat_at or job.created_at
+        if job.status in CalendarExportService.ACTIVE_STATUSES and last_seen < datetime.now() - timeout:
+            CalendarExportService._expire_stale_jobs(user_id)
+            db.session.commit()
+            db.session.refresh(job)
+        return job
+
+    @staticmethod
+    def run_export(job_id):
+        """Execute a queued export job and record its outcome
+
+        Both status changes are compare-and-sets: a job expired while queued
+        never starts, and a job expired while running keeps its failed status
+        instead of being overwritten when the export returns.
+        """
+        # Claim the job: QUEUED -> RUNNING only if nobody expired or started it
+        now = datetime.now()
+        started = db.session.execute(
+            update(CalendarExportJob)
+            .where(CalendarExportJob.id == job_id, CalendarExportJob.status == CalendarExportJob.QUEUED)
+            .values(status=CalendarExportJob.RUNNING, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not started:
+            return None
+
+        job = db.session.get(CalendarExportJob, job_id)
+        app = current_app._get_current_object()
+        interval = app.config['CALENDAR_EXPORT_TIMEOUT_SECONDS'] / 3
+        with _heartbeat(app, job_id, interval):
+            outcome = CalendarExportService._export(job.user_id)
+
+        finished = db.session.execute(
+            update(CalendarExportJob)
+            .where(CalendarExportJob.id == job_id, CalendarExportJob.status == CalendarExportJob.RUNNING)
+            .values(finished_at=datetime.now(), **outcome)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        db.session.refresh(job)
+        if not finished:
+            app.logger.warning(f"Calendar export {job_id} finished after it was marked {job.status}")
+        return job
+
+    @staticmethod
+    def _export(user_id):
+        """Sync the user's tasks to Google Calendar
+
+        Returns:
+            dict: The job columns to record (status and result or error)
+        """
+        try:
+            # The Google client libraries are slow to import and only needed here,
+            # so they are loaded on the first export rather than at worker boot
+            from app.services.calendar_service import CalendarService
+
+            user = db.session.get(User, user_id)
+            if not user:
+                raise ValueError("User not found")
+
+            # Get user's tasks grouped by date
+            tasks_by_date = TaskService.get_user_tasks(user.id)
+
+            if not tasks_by_date:
+                summary = {
+                    "message": "No tasks to export",
+                    "success": 0,
+                    "failed": 0
+                }
+            else:
+                # Sync to calendar (inserts new, patches changed and deletes removed events)
+                result = CalendarService.export_all_tasks_to_calendar(user, tasks_by_date)
+                summary = {
+                    "message": f"Synced {result['success']} tasks to calendar (deleted {result['deleted']} old events)",
+                    "deleted": result['deleted'],
+                    "created": result['created'],
+                    "updated": result['updated'],
+                    "unchanged": result['unchanged'],
+                    "success": result['success'],
+                    "failed": result['failed'],
+                    "errors": result['errors'],
+                    "event_ids": result['event_ids']
+                }
+
+            return {"status": CalendarExportJob.SUCCEEDED, "result": summary}
+        except ValueError as e:
+            db.session.rollback()
+            return {"status": CalendarExportJob.FAILED, "error": str(e)}
+        except Exception as e:
+            db.session.rollback()
+            return {"status": CalendarExportJob.FAILED, "error": f"An unexpected error occurred: {str(e)}"}
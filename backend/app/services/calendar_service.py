@@ -1,13 +1,34 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google.auth import exceptions
-from googleapiclient.discovery import build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
 from datetime import datetime, timedelta
-from app.models import User, Task
+from sqlalchemy import update
+from app.models import User, Task, TaskOccurrences
 from app.extensions import db
 from flask import current_app
 
 
+# Built services hold an httplib2 connection, which is not thread-safe,
+# so each thread keeps its own small cache of services per access token
+_service_cache = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _load_discovery_document():
+    """Parse the Calendar v3 discovery document bundled with googleapiclient once per process"""
+    document = discovery_cache.get_static_doc('calendar', 'v3')
+    if document is None:
+        raise ValueError("Calendar v3 discovery document is not bundled with googleapiclient")
+    return json.loads(document)
+
+
 class CalendarService:
     """Service for Google Calendar API integration"""
     
@@ -25,6 +46,53 @@ class CalendarService:
         'Family': '7',       # Lavender
     }
     
+    # Private extended properties stamped on every app-created event
+    APP_EVENT_PROPERTY = 'appTask'
+    OCCURRENCE_PROPERTY = 'appOccurrenceId'
+    FINGERPRINT_PROPERTY = 'appFingerprint'
+    
+    # Google's batch endpoint accepts at most 50 calls per request
+    BATCH_SIZE = 50
+    
+    # Events requested per page when listing the app's events (API max is 2500)
+    PAGE_SIZE = 250
+    
+    # Batch delete requests allowed in flight at once
+    DELETE_CONCURRENCY = 4
+    
+    # Built services kept per thread (one per access token)
+    SERVICE_CACHE_SIZE = 32
+    
+    @staticmethod
+    def get_service(credentials: Credentials):
+        """
+        Get a Google Calendar service for the given credentials.
+        
+        Services are built from the cached discovery document, so no
+        network fetch or JSON parsing happens here, and are reused for
+        repeated calls with the same access token on the same thread.
+        
+        Args:
+            credentials: Google OAuth credentials
+        
+        Returns:
+            Resource: Google Calendar v3 service
+        """
+        services = getattr(_service_cache, 'services', None)
+        if services is None:
+            services = _service_cache.services = OrderedDict()
+        
+        service = services.get(credentials.token)
+        if service is not None:
+            services.move_to_end(credentials.token)
+            return service
+        
+        service = build_from_document(_load_discovery_document(), credentials=credentials)
+        services[credentials.token] = service
+        if len(services) > CalendarService.SERVICE_CACHE_SIZE:
+            services.popitem(last=False)
+        return service
+    
     @staticmethod
     def get_calendar_credentials(user: User):
         """
@@ -78,7 +146,7 @@ class CalendarService:
         """
         try:
             credentials = CalendarService.get_calendar_credentials(user)
-            service = build('calendar', 'v3', credentials=credentials)
+            service = CalendarService.get_service(credentials)
             
             # Create event object
             event = {
@@ -115,66 +183,208 @@ class CalendarService:
             raise ValueError(f"Failed to create calendar event: {str(e)}")
     
     @staticmethod
-    def delete_calendar_events(user: User, service=None):
+    def build_occurrence_event(task: dict, task_date):
         """
-        Delete all calendar events created by this app for the user.
-        Uses a special marker in the description to identify app-created events.
+        Build the Google Calendar event body for a single task occurrence.
         
         Args:
-            user: User object with valid OAuth tokens
-            service: Optional pre-built Google Calendar service
+            task: Occurrence dict from TaskService.get_user_tasks()
+            task_date: Date the occurrence is due
         
         Returns:
-            dict: {deleted_count, errors}
+            dict: Event body (without the app's extended properties)
         """
+        category = task.get('category', 'General')
+        color_id = CalendarService.CATEGORY_COLORS.get(category, '0')
+        
+        return {
+            'summary': task['title'],
+            # Events are identified by extended properties (see sync_tasks_to_calendar);
+            # this also replaces the AppTask: marker on legacy events when they are patched
+            'description': 'Added by Task Habit Tracker',
+            'start': {'date': task_date.isoformat()},
+            'end': {'date': (task_date + timedelta(days=1)).isoformat()},
+            'colorId': color_id,
+        }
+    
+    @staticmethod
+    def event_fingerprint(event: dict):
+        """Stable content hash of an event body, used to detect changed occurrences"""
+        payload = json.dumps(event, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    
+    @staticmethod
+    def get_event_occurrence_id(event: dict):
+        """
+        Get the task occurrence id an app-created event belongs to.
+        Falls back to the description marker for events created before
+        the extended properties were added.
+        """
+        private = event.get('extendedProperties', {}).get('private', {})
+        raw_id = private.get(CalendarService.OCCURRENCE_PROPERTY)
+        
+        if raw_id is None:
+            description = event.get('description') or ''
+            if not description.startswith('AppTask:'):
+                return None
+            raw_id = description[len('AppTask:'):]
+        
         try:
-            if service is None:
-                credentials = CalendarService.get_calendar_credentials(user)
-                service = build('calendar', 'v3', credentials=credentials)
-            
-            results = {'deleted': 0, 'errors': []}
-            
-            # Get all events from primary calendar
-            events_result = service.events().list(
-                calendarId='primary',
-                q='AppTask:',  # Search for events with AppTask marker
-                maxResults=100
-            ).execute()
+            return int(raw_id)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def execute_batched(service, operations):
+        """
+        Execute API requests through Google's batch endpoint.
+        
+        Args:
+            service: Built Google Calendar service
+            operations: List of (key, request) pairs, where request is an
+                unexecuted googleapiclient request
+        
+        Returns:
+            list: (key, response, exception) tuples in the order given;
+                exactly one of response/exception is set for each item
+        """
+        outcomes = []
+        batch_size = CalendarService.BATCH_SIZE
+        
+        for start in range(0, len(operations), batch_size):
+            chunk = operations[start:start + batch_size]
+            responses = {}
             
-            events = events_result.get('items', [])
+            def collect(request_id, response, exception):
+                responses[request_id] = (response, exception)
             
-            for event in events:
-                try:
-                    service.events().delete(
-                        calendarId='primary',
-                        eventId=event['id']
-                    ).execute()
-                    results['deleted'] += 1
-                except Exception as delete_error:
-                    results['errors'].append({
-                        'event_id': event.get('id'),
-                        'error': str(delete_error)
-                    })
+            batch = service.new_batch_http_request(callback=collect)
+            for index, (_, request) in enumerate(chunk):
+                batch.add(request, request_id=str(index))
             
-            return results
+            try:
+                batch.execute()
+            except Exception as batch_error:
+                # The whole batch request failed; attribute it to every item
+                for index in range(len(chunk)):
+                    responses.setdefault(str(index), (None, batch_error))
             
-        except Exception as e:
-            raise ValueError(f"Failed to delete calendar events: {str(e)}")
+            for index, (key, _) in enumerate(chunk):
+                response, exception = responses.get(
+                    str(index), (None, ValueError("No response in batch"))
+                )
+                outcomes.append((key, response, exception))
+        
+        return outcomes
+    
+    @staticmethod
+    def iter_app_events(service, page_size=None):
+        """
+        Iterate over every calendar event created by this app, page by page.
+        
+        Events are matched on the app's private extended property, so Google
+        only returns the app's own events. Events created before that
+        property existed are still found through the old description marker
+        unless CALENDAR_LEGACY_EVENT_SEARCH is turned off.
+        
+        Args:
+            service: Built Google Calendar service
+            page_size: Events per page (defaults to CALENDAR_PAGE_SIZE)
+        
+        Yields:
+            dict: Google Calendar event objects (id, description and extended properties)
+        """
+        if page_size is None:
+            page_size = current_app.config.get('CALENDAR_PAGE_SIZE', CalendarService.PAGE_SIZE)
+        
+        queries = [{'privateExtendedProperty': f"{CalendarService.APP_EVENT_PROPERTY}=1"}]
+        if current_app.config.get('CALENDAR_LEGACY_EVENT_SEARCH', True):
+            queries.append({'q': 'AppTask:'})
+        
+        seen = set()
+        for query in queries:
+            page_token = None
+            while True:
+                events_result = service.events().list(
+                    calendarId='primary',
+                    maxResults=page_size,
+                    pageToken=page_token,
+                    fields='items(id,description,extendedProperties),nextPageToken',
+                    **query
+                ).execute()
+                
+                for event in events_result.get('items', []):
+                    if event['id'] not in seen:
+                        seen.add(event['id'])
+                        yield event
+                
+                page_token = events_result.get('nextPageToken')
+                if not page_token:
+                    break
+    
+    @staticmethod
+    def delete_events(credentials: Credentials, event_ids, concurrency=None):
+        """
+        Delete events in batches, with a bounded number of batch requests in flight.
+        
+        Args:
+            credentials: Google OAuth credentials
+            event_ids: Iterable of Google Calendar event IDs
+            concurrency: Maximum concurrent batch requests (defaults to CALENDAR_DELETE_CONCURRENCY)
+        
+        Returns:
+            list: (event_id, response, exception) tuples
+        """
+        if concurrency is None:
+            concurrency = current_app.config.get(
+                'CALENDAR_DELETE_CONCURRENCY', CalendarService.DELETE_CONCURRENCY
+            )
+        
+        event_ids = list(event_ids)
+        batch_size = CalendarService.BATCH_SIZE
+        chunks = [event_ids[i:i + batch_size] for i in range(0, len(event_ids), batch_size)]
+        
+        def delete_chunk(chunk):
+            # Each thread builds its requests on its own service (see get_service)
+            service = CalendarService.get_service(credentials)
+            operations = [
+                (event_id, service.events().delete(calendarId='primary', eventId=event_id))
+                for event_id in chunk
+            ]
+            return CalendarService.execute_batched(service, operations)
+        
+        if concurrency <= 1 or len(chunks) <= 1:
+            outcomes = [delete_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+                outcomes = list(pool.map(delete_chunk, chunks))
+        
+        return [outcome for chunk_outcomes in outcomes for outcome in chunk_outcomes]
     
     @staticmethod
     def sync_tasks_to_calendar(user: User, tasks_by_date: dict):
         """
-        Sync all tasks to user's Google Calendar (delete old events, then create new ones).
+        Incrementally sync all tasks to user's Google Calendar.
+        
+        Each occurrence's event carries its occurrence id and a content
+        fingerprint in its private extended properties. Events whose
+        fingerprint still matches are left alone, changed ones are patched,
+        new occurrences are inserted and events for removed occurrences
+        are deleted. Inserts and patches go out through execute_batched(),
+        deletes through delete_events() with several batches in flight.
         
         Args:
             user: User object with valid OAuth tokens
             tasks_by_date: Dictionary of {date: [tasks]} from TaskService.get_user_tasks()
         
         Returns:
-            dict: Summary of sync operation including deleted, created, and errors
+            dict: Summary of sync operation including deleted, created, updated and errors
         """
         results = {
             'deleted': 0,
+            'created': 0,
+            'updated': 0,
+            'unchanged': 0,
             'success': 0,
             'failed': 0,
             'errors': [],
@@ -183,64 +393,145 @@ class CalendarService:
         
         try:
             credentials = CalendarService.get_calendar_credentials(user)
-            service = build('calendar', 'v3', credentials=credentials)
-            
-            # Step 1: Delete all existing app-created events
-            delete_results = CalendarService.delete_calendar_events(user, service)
-            results['deleted'] = delete_results['deleted']
-            results['errors'].extend(delete_results['errors'])
+            service = CalendarService.get_service(credentials)
             
-            # Step 2: Create new events from current tasks
+            # Step 1: Work out the desired event for every current occurrence
+            desired = {}
             for date_str, tasks in tasks_by_date.items():
                 for task in tasks:
-                    try:
-                        # Parse date string (format: YYYY-MM-DD)
-                        task_date = datetime.strptime(str(date_str), '%Y-%m-%d').date()
-                        
-                        # Get task object to store google_event_id
-                        task_obj = db.session.get(Task, task['task_id'])
-                        category = task.get('category', 'General')
-                        color_id = CalendarService.CATEGORY_COLORS.get(category, '0')
-                        
-                        event = {
-                            'summary': task['title'],
-                            'description': f"AppTask:{task['id']}",  # Marker for future deletion
-                            'start': {'date': task_date.isoformat()},
-                            'end': {'date': (task_date + timedelta(days=1)).isoformat()},
-                            'colorId': color_id,
-                        }
-                        
-                        created_event = service.events().insert(
-                            calendarId='primary',
-                            body=event
-                        ).execute()
-                        
-                        # Store event ID on task for future reference
-                        if task_obj:
-                            task_obj.google_event_id = created_event.get('id')
-                            db.session.commit()
-                        
+                    # Parse date string (format: YYYY-MM-DD)
+                    task_date = datetime.strptime(str(date_str), '%Y-%m-%d').date()
+                    event = CalendarService.build_occurrence_event(task, task_date)
+                    desired[task['id']] = (task, str(date_str), event)
+            
+            # Step 2: Match existing app-created events to occurrences
+            existing = {}
+            stale = []
+            for event in CalendarService.iter_app_events(service):
+                occurrence_id = CalendarService.get_event_occurrence_id(event)
+                if occurrence_id not in desired or occurrence_id in existing:
+                    stale.append(event)
+                else:
+                    existing[occurrence_id] = event
+            
+            # Step 3: Queue inserts for new occurrences and patches for changed ones
+            operations = []
+            synced = {}  # occurrence id -> event id
+            for occurrence_id, (task, date_str, event) in desired.items():
+                fingerprint = CalendarService.event_fingerprint(event)
+                current = existing.get(occurrence_id)
+                
+                if current is not None:
+                    private = current.get('extendedProperties', {}).get('private', {})
+                    if private.get(CalendarService.FINGERPRINT_PROPERTY) == fingerprint:
+                        results['unchanged'] += 1
                         results['success'] += 1
-                        results['event_ids'].append(created_event.get('id'))
-                        
-                    except Exception as task_error:
-                        results['failed'] += 1
-                        results['errors'].append({
-                            'task': task.get('title', 'Unknown'),
-                            'date': str(date_str),
-                            'error': str(task_error)
-                        })
+                        results['event_ids'].append(current['id'])
+                        synced[occurrence_id] = current['id']
+                        continue
+                
+                body = dict(event)
+                body['extendedProperties'] = {
+                    'private': {
+                        CalendarService.APP_EVENT_PROPERTY: '1',
+                        CalendarService.OCCURRENCE_PROPERTY: str(occurrence_id),
+                        CalendarService.FINGERPRINT_PROPERTY: fingerprint,
+                    }
+                }
+                
+                if current is not None:
+                    request = service.events().patch(
+                        calendarId='primary',
+                        eventId=current['id'],
+                        body=body
+                    )
+                    operations.append((('updated', task, date_str), request))
+                else:
+                    request = service.events().insert(
+                        calendarId='primary',
+                        body=body
+                    )
+                    operations.append((('created', task, date_str), request))
+            
+            # Step 4: Send the inserts and patches in batches and map results back per item
+            for (kind, item, date_str), response, error in CalendarService.execute_batched(service, operations):
+                if error is not None:
+                    results['failed'] += 1
+                    results['errors'].append({
+                        'task': item.get('title', 'Unknown'),
+                        'date': date_str,
+                        'error': str(error)
+                    })
+                    continue
+                
+                results[kind] += 1
+                results['success'] += 1
+                results['event_ids'].append(response.get('id'))
+                synced[item['id']] = response.get('id')
+            
+            # Step 5: Delete events whose occurrence no longer exists
+            stale_ids = [event['id'] for event in stale]
+            for event_id, _, error in CalendarService.delete_events(credentials, stale_ids):
+                if error is not None:
+                    results['errors'].append({
+                        'event_id': event_id,
+                        'error': str(error)
+                    })
+                else:
+                    results['deleted'] += 1
+            
+            # Step 6: Store the event ids for future reference in a single transaction
+            CalendarService.save_task_event_ids(user, synced)
             
             return results
             
         except Exception as e:
             raise ValueError(f"Failed to sync tasks to calendar: {str(e)}")
     
+    @staticmethod
+    def save_task_event_ids(user: User, synced: dict):
+        """
+        Persist the Google Calendar event of each task's first occurrence.
+        
+        The per-occurrence links themselves live on the events (in their
+        extended properties), which the sync lists anyway. This loads the
+        user's occurrences in one query and writes only the
+        Task.google_event_id values that changed, committing once.
+        
+        Args:
+            user: User the sync ran for
+            synced: Dictionary of {occurrence_id: event_id}
+        """
+        rows = db.session.query(
+            TaskOccurrences.id,
+            Task.id,
+            Task.google_event_id
+        ).join(Task).filter(
+            Task.user_id == user.id
+        ).order_by(TaskOccurrences.id).all()
+        
+        first_events = {}  # task id -> (stored event id, first synced event id)
+        for occurrence_id, task_id, task_event_id in rows:
+            event_id = synced.get(occurrence_id)
+            if event_id is not None:
+                first_events.setdefault(task_id, (task_event_id, event_id))
+        
+        # Task.google_event_id keeps the event of the task's first occurrence
+        updates = [
+            {'id': task_id, 'google_event_id': event_id}
+            for task_id, (stored_event_id, event_id) in first_events.items()
+            if stored_event_id != event_id
+        ]
+        if updates:
+            db.session.execute(update(Task), updates)
+        
+        db.session.commit()
+    
     @staticmethod
     def export_all_tasks_to_calendar(user: User, tasks_by_date: dict):
         """
         Export all tasks to user's Google Calendar.
-        Now uses sync_tasks_to_calendar to prevent duplicates.
+        Uses sync_tasks_to_calendar so only changed occurrences hit the API.
         
         Args:
             user: User object with valid OAuth tokens
@@ -0,0 +1,167 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import bindparam, update
+from app.extensions import db
+from app.models import Task, TaskOccurrences
+from app.services.task_service import TaskService
+
+
+logger = logging.getLogger(__name__)
+
+_scheduler = None
+_scheduler_stop = threading.Event()
+_scheduler_lock = threading.Lock()
+
+
+def start_rollover_scheduler(app):
+    """Start the process-wide thread that runs the overdue sweep every
+    ROLLOVER_INTERVAL_SECONDS (at most one per process)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            return _scheduler
+
+        interval = app.config.get('ROLLOVER_INTERVAL_SECONDS', 3600)
+        _scheduler_stop.clear()
+
+        def run():
+            while not _scheduler_stop.wait(interval):
+                with app.app_context():
+                    try:
+                        RolloverService.sweep_overdue()
+                    except Exception:
+                        logger.exception("Overdue rollover sweep failed")
+                    finally:
+                        db.session.remove()
+
+        _scheduler = threading.Thread(target=run, name='rollover-scheduler', daemon=True)
+        _scheduler.start()
+        return _scheduler
+
+
+def stop_rollover_scheduler():
+    """Stop the scheduler thread, if running, and wait for it to exit"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            return
+        _scheduler_stop.set()
+        _scheduler.join()
+        _scheduler = None
+
+
+class RolloverService:
+    """Moves overdue occurrences forward and resets the streaks they broke.
+
+    Without the sweep an occurrence only advances when its user completes
+    it, so missed occurrences keep past due dates and their streaks are
+    only reset on the next (late) completion. The sweep does both in
+    set-based SQL, a chunk of users per transaction.
+    """
+
+    @staticmethod
+    def sweep_overdue(now=None, chunk_size=None):
+        """Advance every overdue occurrence and reset its task's streak
+
+        An overdue occurrence moves to the first of its weekdays on or after
+        today, and every task with an overdue occurrence gets a streak of 0.
+        Users are processed in chunks of CHUNK_SIZE, one transaction each, so
+        locks are held briefly and a failure only rolls back one chunk.
+        Safe to run concurrently with completions and with other sweeps.
+
+        Args:
+            now: Optional datetime to sweep as of (default: now)
+            chunk_size: Users per transaction (default: ROLLOVER_USER_CHUNK)
+
+        Returns:
+            dict: Numbers of 'users', 'occurrences' and 'tasks' swept
+        """
+        now = now or datetime.now()
+        if chunk_size is None:
+            chunk_size = current_app.config.get('ROLLOVER_USER_CHUNK', 200)
+
+        totals = {'users': 0, 'occurrences': 0, 'tasks': 0}
+        after_user_id = 0
+        while True:
+            # Keyset over users that have overdue occurrences
+            user_ids = db.session.scalars(
+                db.select(Task.user_id)
+                .join(TaskOccurrences)
+                .where(TaskOccurrences.next_due_at < now, Task.user_id > after_user_id)
+                .group_by(Task.user_id)
+                .order_by(Task.user_id)
+                .limit(chunk_size)
+            ).all()
+            if not user_ids:
+                break
+
+            swept = RolloverService._sweep_users(user_ids, now)
+            totals['users'] += len(user_ids)
+            totals['occurrences'] += swept['occurrences']
+            totals['tasks'] += swept['tasks']
+            after_user_id = user_ids[-1]
+
+        if totals['users']:
+            logger.info("Overdue rollover: %s", totals)
+        return totals
+
+    @staticmethod
+    def _sweep_users(user_ids, now):
+        """Sweep the overdue occurrences of USER_IDS in one transaction"""
+        rows = db.session.execute(
+            db.select(
+                TaskOccurrences.id,
+                TaskOccurrences.task_id,
+                TaskOccurrences.frequency,
+                TaskOccurrences.next_due_at
+            )
+            .join(Task)
+            .where(Task.user_id.in_(user_ids), TaskOccurrences.next_due_at < now)
+            .with_for_update()
+        ).all()
+        if not rows:
+            db.session.rollback()
+            return {'occurrences': 0, 'tasks': 0}
+
+        task_ids = {task_id for _, task_id, _, _ in rows}
+
+        # Reset streaks of tasks still overdue; an occurrence completed since
+        # the read above is no longer overdue and keeps its streak
+        still_overdue = db.select(TaskOccurrences.task_id).where(
+            TaskOccurrences.task_id.in_(task_ids),
+            TaskOccurrences.next_due_at < now
+        )
+        tasks_reset = db.session.execute(
+            update(Task)
+            .where(Task.id.in_(still_overdue))
+            .values(streak=0)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        # Due dates strictly after yesterday, i.e. the first matching weekday on or after today
+        next_due_dates = TaskService.get_next_due_dates(
+            [frequency for _, _, frequency, _ in rows],
+            [due_at for _, _, _, due_at in rows],
+            today=now - timedelta(days=1)
+        )
+
+        # Compare-and-set, so occurrences completed meanwhile are left alone
+        occurrences_table = TaskOccurrences.__table__
+        advanced = db.session.execute(
+            update(occurrences_table)
+            .where(
+                occurrences_table.c.id == bindparam('occurrence_id'),
+                occurrences_table.c.next_due_at == bindparam('read_due_at')
+            )
+            .values(next_due_at=bindparam('next_due_at')),
+            [
+                {'occurrence_id': occurrence_id, 'read_due_at': due_at, 'next_due_at': next_due_at}
+                for (occurrence_id, _, _, due_at), next_due_at in zip(rows, next_due_dates)
+            ]
+        ).rowcount
+
+        TaskService._mark_many_tasks_changed(user_ids)
+        db.session.commit()
+        return {'occurrences': advanced, 'tasks': tasks_reset}
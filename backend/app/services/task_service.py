@@ -1,7 +1,13 @@
-from app.extensions import db
-from app.models import Task, TaskCompletion, TaskOccurrences
-from datetime import datetime, timedelta
-from collections import defaultdict, OrderedDict
+from app.extensions import db, get_task_cache
+from sqlalchemy import Date, and_, bindparam, case, cast, delete, func, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from app.models import User, Task, TaskCompletion, TaskOccurrences, TaskListVersion, TaskSummary
+from datetime import date, datetime, time, timedelta
+from collections import OrderedDict
+
+
+# 23:59:59, the time of day every occurrence is due at
+END_OF_DAY_SECONDS = 24 * 60 * 60 - 1
 
 
 class TaskService:
@@ -18,43 +24,234 @@ class TaskService:
         'sun': 6,
     }
 
+    # Maximum number of tasks accepted by create_tasks (and occurrences by complete_tasks)
+    BULK_LIMIT = 100
+
+    # Page size limits for get_completion_history
+    HISTORY_PAGE_SIZE = 50
+    HISTORY_MAX_PAGE_SIZE = 200
+
+    # Per-occurrence outcomes reported by complete_tasks
+    COMPLETED = 'completed'
+    NOT_FOUND = 'not_found'
+    NOT_EARLIEST = 'not_earliest'
+    DUPLICATE = 'duplicate'
+    CONFLICT = 'conflict'
+
+    # Times complete_tasks re-reads the rows after losing a compare-and-set to a concurrent completion
+    COMPLETE_ATTEMPTS = 3
+
     # -- HELPER FUNCTION --
     # Gets the next occurrence of FREQUENCY (mon = get next monday, tue = get next tuesday)
     @staticmethod
-    def get_next_due_date(frequency, occurrence_due_date=datetime.now()):
-        """Calculate the next due date based on weekly frequency rules."""
+    def get_next_due_date(frequency, occurrence_due_date=None):
+        """Calculate the next due date based on weekly frequency rules.
+        The occurrence due date defaults to now."""
+        if occurrence_due_date is None:
+            occurrence_due_date = datetime.now()
+        return TaskService.get_next_due_dates([frequency], [occurrence_due_date])[0]
 
-        if frequency.lower() not in TaskService.DAY_MAPPING:
+    # -- HELPER FUNCTION --
+    # Vectorized get_next_due_date for many (frequency, due date) pairs
+    @staticmethod
+    def get_next_due_dates(frequencies, occurrence_due_dates, today=None):
+        """Calculate next due dates for many occurrences at once
+        
+        Same rules as get_next_due_date, computed with NumPy datetime64
+        arithmetic instead of one datetime at a time:
+        RULE 1: If an occurrence is due before today → base from TODAY
+        RULE 2: If due today or in the future → base from its due date
+        The next due date is the first FREQUENCY weekday strictly after the
+        base, at the end of the day.
+        
+        Args:
+            frequencies: Sequence of day strings ('mon' ... 'sun')
+            occurrence_due_dates: Sequence of datetimes, one per frequency
+            today: Optional datetime to use as today (default: now)
+        
+        Returns:
+            List of datetimes, in the order given
+        """
+        if len(frequencies) != len(occurrence_due_dates):
+            raise ValueError("frequencies and occurrence_due_dates must have the same length")
+        if not frequencies:
+            return []
+        
+        # NumPy adds tens of milliseconds to worker boot, so it is loaded on first use
+        import numpy as np
+        
+        try:
+            target_weekdays = np.array(
+                [TaskService.DAY_MAPPING[freq.lower()] for freq in frequencies],
+                dtype=np.int64
+            )
+        except (KeyError, AttributeError):
             raise ValueError(
                 f"Invalid frequency. Must be one of: {', '.join(TaskService.DAY_MAPPING.keys())}"
             )
+        
+        today = np.datetime64(today or datetime.now(), 'D')
+        occurrence_days = np.array(occurrence_due_dates, dtype='datetime64[D]')
+        base_dates = np.maximum(occurrence_days, today)
+        
+        # 1970-01-01 (day 0) was a Thursday, weekday 3
+        base_weekdays = (base_dates.astype(np.int64) + 3) % 7
+        
+        # Days until the next target weekday, 1-7 (same weekday means next week)
+        days_ahead = (target_weekdays - base_weekdays - 1) % 7 + 1
+        
+        # Set due time to end of day
+        next_due = (base_dates + days_ahead).astype('datetime64[s]') + np.timedelta64(END_OF_DAY_SECONDS, 's')
+        return next_due.tolist()
 
-        target_weekday = TaskService.DAY_MAPPING[frequency.lower()]
+    # -- HELPER FUNCTION --
+    # Records that USER's task list changed; call before the mutation's commit
+    @staticmethod
+    def _mark_tasks_changed(user_id):
+        """Bump the user's task list version inside the current transaction.
+        Cached task lists are keyed by version, so every worker stops serving
+        the old one once the transaction commits."""
+        TaskService._mark_many_tasks_changed([user_id])
 
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        occurrence_day = occurrence_due_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    # -- HELPER FUNCTION --
+    # _mark_tasks_changed for many users with one UPDATE
+    @staticmethod
+    def _mark_many_tasks_changed(user_ids):
+        """Bump the task list versions and drop the summaries of USER_IDS
+        inside the current transaction."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        # The next get_summary recomputes it, so writes never pay for the aggregate
+        db.session.execute(
+            delete(TaskSummary)
+            .where(TaskSummary.user_id.in_(user_ids))
+            .execution_options(synchronize_session=False)
+        )
 
-        # RULE 1: If occurrence due date is earlier than today → base from TODAY
-        if occurrence_day < today:
-            base_date = today
-        else:
-            # RULE 2: If due today or in the future → base from OCCURRENCE DUE DATE
-            base_date = occurrence_day
+        bump = (
+            update(TaskListVersion)
+            .where(TaskListVersion.user_id.in_(user_ids))
+            .values(version=TaskListVersion.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        bumped = db.session.execute(bump).rowcount
 
-        base_weekday = base_date.weekday()
+        if bumped == len(user_ids):
+            return
 
-        # Calculate how many days until the next target weekday
-        days_ahead = target_weekday - base_weekday
-        if days_ahead <= 0:
-            days_ahead += 7  # next week
+        # First change for some users: create their rows, tolerating a concurrent insert
+        existing = set(db.session.scalars(
+            db.select(TaskListVersion.user_id).where(TaskListVersion.user_id.in_(user_ids))
+        ))
+        missing = user_ids - existing
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    insert(TaskListVersion),
+                    [{'user_id': user_id, 'version': 1} for user_id in missing]
+                )
+        except IntegrityError:
+            db.session.execute(bump.where(TaskListVersion.user_id.in_(missing)))
 
-        next_due = base_date + timedelta(days=days_ahead)
+    @staticmethod
+    def refresh_summaries(user_ids, today=None):
+        """Recompute the dashboard summaries of USER_IDS inside the current transaction
+        
+        All users are aggregated by one query of correlated subqueries (each
+        served by an index on user_id or task_id), and their rows replaced
+        by one DELETE and one INSERT.
+        
+        Args:
+            user_ids: Iterable of user IDs
+            today: Optional date the summaries are computed for (default: today)
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        
+        today = today or date.today()
+        day_start = datetime.combine(today, time.min)
+        day_end = day_start + timedelta(days=1)
+        week_start = day_start - timedelta(days=today.weekday())
+        
+        def occurrence_count(*conditions):
+            return db.select(func.count(TaskOccurrences.id)).join(Task).where(
+                Task.user_id == User.id, *conditions
+            ).scalar_subquery()
+        
+        rows = db.session.execute(
+            db.select(
+                User.id,
+                db.select(func.count(Task.id)).where(Task.user_id == User.id).scalar_subquery(),
+                occurrence_count(TaskOccurrences.next_due_at >= day_start, TaskOccurrences.next_due_at < day_end),
+                occurrence_count(TaskOccurrences.next_due_at < day_start),
+                db.select(func.coalesce(func.max(Task.streak), 0)).where(Task.user_id == User.id).scalar_subquery(),
+                db.select(func.count(TaskCompletion.id)).join(Task).where(
+                    Task.user_id == User.id, TaskCompletion.completed_at >= week_start
+                ).scalar_subquery(),
+            ).where(User.id.in_(user_ids))
+        ).all()
+        
+        db.session.execute(
+            delete(TaskSummary)
+            .where(TaskSummary.user_id.in_(user_ids))
+            .execution_options(synchronize_session=False)
+        )
+        if rows:
+            db.session.execute(insert(TaskSummary), [
+                {
+                    'user_id': user_id,
+                    'as_of': today,
+                    'total_tasks': total_tasks,
+                    'due_today': due_today,
+                    'overdue': overdue,
+                    'best_streak': best_streak,
+                    'completions_this_week': completions_this_week,
+                }
+                for user_id, total_tasks, due_today, overdue, best_streak, completions_this_week in rows
+            ])
 
-        # Set due time to end of day
-        next_due = next_due.replace(hour=23, minute=59, second=59)
+    @staticmethod
+    def get_summary(user_id, today=None):
+        """Get the user's dashboard summary
+        
+        A point lookup of the row cached by an earlier call. Task writes
+        delete the row, and it is also recomputed when it was computed on an
+        earlier day, since due today, overdue and this week's counts depend
+        on the date.
+        
+        Args:
+            user_id: User ID
+            today: Optional date to get the summary for (default: today)
+        
+        Returns:
+            TaskSummary: The user's summary
+        """
+        today = today or date.today()
+        summary = db.session.get(TaskSummary, user_id)
+        if summary is not None and summary.as_of == today:
+            return summary
+        
+        if summary is not None:
+            db.session.expunge(summary)
+        try:
+            TaskService.refresh_summaries([user_id], today)
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request inserted the row first; use theirs
+            db.session.rollback()
+        return db.session.get(TaskSummary, user_id)
 
-        return next_due
+    @staticmethod
+    def task_list_cache_key(user_id, version):
+        return f"user_tasks:{user_id}:{version}"
 
+    @staticmethod
+    def get_tasks_version(user_id):
+        """Get the user's task list version (0 if the list has never changed)."""
+        version = db.session.query(TaskListVersion.version).filter_by(user_id=user_id).scalar()
+        return version or 0
 
 
     @staticmethod
@@ -86,8 +283,9 @@ class TaskService:
         db.session.flush()  # Get the task ID without committing
         
         # Create occurrences for each frequency
-        for freq in frequencies:
-            next_due_at = TaskService.get_next_due_date(freq)
+        now = datetime.now()
+        next_due_dates = TaskService.get_next_due_dates(frequencies, [now] * len(frequencies), today=now)
+        for freq, next_due_at in zip(frequencies, next_due_dates):
             occurrence = TaskOccurrences(
                 task_id=task.id,
                 frequency=freq.lower(),
@@ -95,54 +293,149 @@ class TaskService:
             )
             db.session.add(occurrence)
         
+        TaskService._mark_tasks_changed(user_id)
         db.session.commit()
         return task
 
+    @staticmethod
+    def create_tasks(user_id, task_specs):
+        """Create many tasks and their occurrences in one transaction
+        
+        Args:
+            user_id: User ID
+            task_specs: List of dicts with 'title', 'frequency' (day string or list
+                of days) and optional 'category'
+        
+        Returns:
+            List of the created task IDs, in the order given
+        
+        Raises:
+            ValueError: If any spec is invalid (nothing is inserted)
+        """
+        if not isinstance(task_specs, list) or not task_specs:
+            raise ValueError("tasks must be a non-empty list")
+        if len(task_specs) > TaskService.BULK_LIMIT:
+            raise ValueError(f"At most {TaskService.BULK_LIMIT} tasks can be created at once")
+        
+        # Validate everything before touching the database
+        validated = []
+        for index, spec in enumerate(task_specs):
+            if not isinstance(spec, dict):
+                raise ValueError(f"tasks[{index}]: must be an object")
+            title = spec.get('title')
+            if not title:
+                raise ValueError(f"tasks[{index}]: title is required")
+            frequency = spec.get('frequency')
+            frequencies = frequency if isinstance(frequency, list) else [frequency]
+            if not frequencies or not all(isinstance(freq, str) for freq in frequencies):
+                raise ValueError(f"tasks[{index}]: frequency is required")
+            for freq in frequencies:
+                if freq.lower() not in TaskService.DAY_MAPPING:
+                    raise ValueError(
+                        f"tasks[{index}]: Invalid frequency: {freq}. Must be one of: {', '.join(TaskService.DAY_MAPPING.keys())}"
+                    )
+            validated.append((title, spec.get('category') or 'General', [freq.lower() for freq in frequencies]))
+        
+        tasks = [
+            Task(user_id=user_id, title=title, category=category)
+            for title, category, _ in validated
+        ]
+        db.session.add_all(tasks)
+        # The flush needs each task's generated ID: where INSERT ... RETURNING is
+        # available (SQLite, PostgreSQL) the tasks go in one batched statement,
+        # on MySQL it is one INSERT per task. The occurrences below are always
+        # a single executemany
+        db.session.flush()
+        
+        # Every task due on the same weekday gets the same next due date
+        weekdays = list(TaskService.DAY_MAPPING)
+        now = datetime.now()
+        due_dates = dict(zip(weekdays, TaskService.get_next_due_dates(weekdays, [now] * len(weekdays), today=now)))
+        occurrence_rows = [
+            {
+                'task_id': task.id,
+                'frequency': freq,
+                'next_due_at': due_dates[freq],
+            }
+            for task, (_, _, frequencies) in zip(tasks, validated)
+            for freq in frequencies
+        ]
+        db.session.execute(insert(TaskOccurrences), occurrence_rows)
+        
+        TaskService._mark_tasks_changed(user_id)
+        db.session.commit()
+        return [task.id for task in tasks]
+
     @staticmethod
     def get_task(task_id):
         """Get a task by ID"""
         return db.session.get(Task, task_id)
 
     @staticmethod
-    def get_user_tasks(user_id):
-        """Get all task occurrences for a user with task details, grouped by due date
+    def get_user_tasks(user_id, start=None, end=None, limit=None, version=None):
+        """Get task occurrences for a user with task details, grouped by due date
         
         Args:
             user_id: User ID
+            start: Optional datetime; only occurrences due at or after it are returned
+            end: Optional datetime; only occurrences due before it are returned
+            limit: Optional maximum number of occurrences to return
+            version: The user's task list version, if the caller already read it
             
         Returns:
             Dictionary with due dates as keys and lists of occurrence data (including
-            task title and streak) as values, sorted by due date
+            task title and streak) as values, sorted by due date. The full list
+            (no window or limit) is served from the task cache, so callers must
+            not modify it.
         """
         
-        # Query with JOIN to get occurrences with their task details
-        occurrences_with_tasks = db.session.query(
-            TaskOccurrences,
+        cache_key = None
+        if start is None and end is None and limit is None:
+            # Keyed by version: a list cached before any write, by any worker, is never reused after it
+            if version is None:
+                version = TaskService.get_tasks_version(user_id)
+            cache_key = TaskService.task_list_cache_key(user_id, version)
+            cached = get_task_cache().get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Select only the needed columns; filtering, ordering and limiting happen in SQL
+        query = db.session.query(
+            TaskOccurrences.id,
+            TaskOccurrences.task_id,
+            TaskOccurrences.frequency,
+            TaskOccurrences.next_due_at,
             Task.title,
             Task.streak,
             Task.category
-        ).join(Task).filter(Task.user_id == user_id).all()
-        
-        # Group by due date
-        grouped = defaultdict(list)
-        for occurrence, task_title, streak, category in occurrences_with_tasks:
-            due_date = occurrence.next_due_at.date()
-            # Create a dictionary with occurrence data and task info
-            occurrence_data = {
-                'id': occurrence.id,
-                'task_id': occurrence.task_id,
-                'frequency': occurrence.frequency,
-                'next_due_at': occurrence.next_due_at,
+        ).join(Task).filter(Task.user_id == user_id)
+        
+        if start is not None:
+            query = query.filter(TaskOccurrences.next_due_at >= start)
+        if end is not None:
+            query = query.filter(TaskOccurrences.next_due_at < end)
+        
+        query = query.order_by(TaskOccurrences.next_due_at, TaskOccurrences.id)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        # Rows arrive sorted by due date, so grouping keeps that order
+        grouped = OrderedDict()
+        for occurrence_id, task_id, frequency, next_due_at, task_title, streak, category in query:
+            grouped.setdefault(next_due_at.date(), []).append({
+                'id': occurrence_id,
+                'task_id': task_id,
+                'frequency': frequency,
+                'next_due_at': next_due_at,
                 'title': task_title,
                 'streak': streak,
                 'category': category
-            }
-            grouped[due_date].append(occurrence_data)
+            })
         
-        # Sort by due date and return as ordered dictionary
-        sorted_grouped = OrderedDict(sorted(grouped.items()))
+        if cache_key is not None:
+            get_task_cache().set(cache_key, grouped)
         
-        return sorted_grouped
+        return grouped
 
     @staticmethod
     def update_task_name(user_id, task_id, new_title):
@@ -150,6 +443,7 @@ class TaskService:
         task = db.session.get(Task, task_id)
         if task and task.user_id == user_id:
             task.title = new_title
+            TaskService._mark_tasks_changed(user_id)
             db.session.commit()
             return task
         return None
@@ -160,54 +454,340 @@ class TaskService:
         task = db.session.get(Task, task_id)
         if task and task.user_id == user_id:
             db.session.delete(task)
+            TaskService._mark_tasks_changed(user_id)
             db.session.commit()
             return True
         return False
 
     @staticmethod
-    def complete_task(user_id, occurrence_id):
+    def complete_task(user_id, occurrence_id, expected_due_at=None):
         """Mark a task as completed and create next occurrence
+        
+        Runs as one transaction: a single joined fetch (locking the rows on
+        databases that support SELECT ... FOR UPDATE), then a compare-and-set
+        on the occurrence's due date and an in-place streak update, so
+        concurrent completions can never lose a streak increment.
+        
+        Args:
+            expected_due_at: The occurrence's next_due_at as the client saw it
+                (from GET /tasks). A completion that waited on the lock reads the
+                already-advanced occurrence, so without this a repeated request
+                would complete the next due date too.
+        
+        Raises:
+            ValueError: The occurrence is no longer due at expected_due_at, or
+                a concurrent completion advanced it first
         """
-        occurrence = db.session.get(TaskOccurrences, occurrence_id)
-        if not occurrence:
-            return None
-
-        task_id = occurrence.task_id
-
-        task = db.session.get(Task, task_id)
-        if not task or task.user_id != user_id:
-            return None
-            
-        # Get the current occurrence
-        current_occurrence = TaskOccurrences.query.filter_by(task_id=task_id).order_by(
+        # Only the task's earliest occurrence can be completed
+        earlier = db.aliased(TaskOccurrences)
+        has_earlier = db.session.query(earlier.id).filter(
+            earlier.task_id == TaskOccurrences.task_id,
+            earlier.next_due_at < TaskOccurrences.next_due_at
+        ).exists()
+        
+        row = db.session.query(
+            TaskOccurrences.task_id,
+            TaskOccurrences.frequency,
             TaskOccurrences.next_due_at
-        ).first()
+        ).join(Task).filter(
+            TaskOccurrences.id == occurrence_id,
+            Task.user_id == user_id,
+            ~has_earlier
+        ).with_for_update().first()
         
-        if not current_occurrence:
-            return None
-
-        if occurrence.id != current_occurrence.id:
+        if not row:
+            db.session.rollback()
             return None
         
+        task_id, frequency, due_at = row
+        if expected_due_at is not None and due_at != expected_due_at:
+            db.session.rollback()
+            raise ValueError("Task occurrence was already completed")
+        
+        next_due_at = TaskService.get_next_due_date(frequency, due_at)
+        
+        # Advance the occurrence only if nobody completed it since we read it
+        advanced = db.session.execute(
+            update(TaskOccurrences)
+            .where(TaskOccurrences.id == occurrence_id, TaskOccurrences.next_due_at == due_at)
+            .values(next_due_at=next_due_at)
+        ).rowcount
+        if not advanced:
+            db.session.rollback()
+            raise ValueError("Task occurrence was already completed")
+        
+        # Completed before due date increments the streak, otherwise it resets
+        completed_early = datetime.now() < due_at
+        db.session.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(streak=Task.streak + 1 if completed_early else 1)
+        )
+        
         # Create completion record
         completion = TaskCompletion(task_id=task_id)
         db.session.add(completion)
         
-        # Check if completed before due date
-        now = datetime.now()
-        if now < current_occurrence.next_due_at:
-            # Completed early - increment streak
-            task.streak += 1
-        else:
-            # Completed on or after due date - reset streak
-            task.streak = 1
+        TaskService._mark_tasks_changed(user_id)
+        db.session.commit()
+        return completion
+
+    @staticmethod
+    def complete_tasks(user_id, occurrence_ids, expected_due_dates=None):
+        """Mark many task occurrences as completed in one transaction
+        
+        Occurrences are applied in the order given, with the same rules as
+        complete_task: only a task's earliest occurrence can be completed, and
+        each completion increments the streak if it is early or resets it to 1
+        otherwise. Completing a task's occurrence can make the task's next
+        occurrence the earliest, so a whole week of one task can be checked off
+        at once. All rows are read in one query and written with one UPDATE per
+        table plus one INSERT, whatever the number of occurrences.
+        
+        Args:
+            user_id: User ID
+            occurrence_ids: List of occurrence IDs (at most BULK_LIMIT)
+            expected_due_dates: Optional dict of occurrence ID to the next_due_at
+                the client saw; an occurrence whose due date has moved on since
+                (a retried request) is not completed again
         
-        # Create next occurrence
-        next_due_at = TaskService.get_next_due_date(occurrence.frequency, occurrence.next_due_at)
+        Returns:
+            List of dicts with 'id', 'status' and, for completed occurrences,
+            'next_due_at', in the order given. Status is one of COMPLETED,
+            NOT_FOUND (missing or owned by another user), NOT_EARLIEST,
+            DUPLICATE (the ID was already given earlier in the list) or
+            CONFLICT (the due date differs from the expected one, or concurrent
+            completions kept winning the race for COMPLETE_ATTEMPTS attempts,
+            so nothing was completed).
+        
+        Raises:
+            ValueError: If occurrence_ids is not a valid list (nothing is changed)
+        """
+        if not isinstance(occurrence_ids, list) or not occurrence_ids:
+            raise ValueError("ids must be a non-empty list")
+        if len(occurrence_ids) > TaskService.BULK_LIMIT:
+            raise ValueError(f"At most {TaskService.BULK_LIMIT} occurrences can be completed at once")
+        if not all(isinstance(occurrence_id, int) and not isinstance(occurrence_id, bool)
+                   for occurrence_id in occurrence_ids):
+            raise ValueError("ids must be integers")
+        
+        expected_due_dates = expected_due_dates or {}
+        
+        # Compare-and-set row counts are only trustworthy if the driver reports them for executemany
+        check_rowcount = db.engine.dialect.supports_sane_multi_rowcount
+        
+        for attempt in range(1, TaskService.COMPLETE_ATTEMPTS + 1):
+            # Fetch every occurrence of the affected tasks, locking them where supported
+            requested_tasks = db.session.query(TaskOccurrences.task_id).filter(
+                TaskOccurrences.id.in_(set(occurrence_ids))
+            )
+            rows = db.session.query(
+                TaskOccurrences.id,
+                TaskOccurrences.task_id,
+                TaskOccurrences.frequency,
+                TaskOccurrences.next_due_at
+            ).join(Task).filter(
+                Task.user_id == user_id,
+                TaskOccurrences.task_id.in_(requested_tasks)
+            ).with_for_update().all()
+            
+            # Each occurrence is completed at most once, so every next due date
+            # follows from the due date read and can be computed in one batch
+            now = datetime.now()
+            next_due_dates = TaskService.get_next_due_dates(
+                [frequency for _, _, frequency, _ in rows],
+                [due_at for _, _, _, due_at in rows],
+                today=now
+            )
+            
+            occurrences = {}
+            due_by_task = {}
+            for (occurrence_id, task_id, _, due_at), next_due_at in zip(rows, next_due_dates):
+                occurrences[occurrence_id] = (task_id, due_at, next_due_at)
+                due_by_task.setdefault(task_id, {})[occurrence_id] = due_at
+            
+            results = []
+            seen = set()
+            advanced = {}   # occurrence_id -> (due date read, new due date)
+            streak_changes = {}
+            completed_task_ids = []
+            for occurrence_id in occurrence_ids:
+                if occurrence_id in seen:
+                    results.append({'id': occurrence_id, 'status': TaskService.DUPLICATE})
+                    continue
+                seen.add(occurrence_id)
+                
+                if occurrence_id not in occurrences:
+                    results.append({'id': occurrence_id, 'status': TaskService.NOT_FOUND})
+                    continue
+                
+                task_id, due_at, next_due_at = occurrences[occurrence_id]
+                if expected_due_dates.get(occurrence_id, due_at) != due_at:
+                    results.append({'id': occurrence_id, 'status': TaskService.CONFLICT})
+                    continue
+                
+                task_dues = due_by_task[task_id]
+                if any(other < due_at for other in task_dues.values()):
+                    results.append({'id': occurrence_id, 'status': TaskService.NOT_EARLIEST})
+                    continue
+                
+                task_dues[occurrence_id] = next_due_at
+                advanced[occurrence_id] = (due_at, next_due_at)
+                
+                # Completed before due date increments the streak, otherwise it resets.
+                # Kept as (reset, value) so increments stay relative to the stored streak
+                reset, value = streak_changes.get(task_id, (False, 0))
+                streak_changes[task_id] = (reset, value + 1) if now < due_at else (True, 1)
+                completed_task_ids.append(task_id)
+                
+                results.append({
+                    'id': occurrence_id,
+                    'status': TaskService.COMPLETED,
+                    'next_due_at': next_due_at,
+                })
+            
+            if not advanced:
+                db.session.rollback()
+                return results
+            
+            # Advance each occurrence only if nobody completed it since we read it
+            occurrences_table = TaskOccurrences.__table__
+            advanced_count = db.session.execute(
+                update(occurrences_table)
+                .where(
+                    occurrences_table.c.id == bindparam('occurrence_id'),
+                    occurrences_table.c.next_due_at == bindparam('read_due_at')
+                )
+                .values(next_due_at=bindparam('next_due_at')),
+                [
+                    {'occurrence_id': occurrence_id, 'read_due_at': read_due_at, 'next_due_at': next_due_at}
+                    for occurrence_id, (read_due_at, next_due_at) in advanced.items()
+                ]
+            ).rowcount
+            if check_rowcount and advanced_count != len(advanced):
+                # A concurrent completion got there first: start over from fresh rows,
+                # or give up and report what would have been completed as conflicting
+                db.session.rollback()
+                if attempt < TaskService.COMPLETE_ATTEMPTS:
+                    continue
+                return [
+                    {'id': result['id'], 'status': TaskService.CONFLICT}
+                    if result['status'] == TaskService.COMPLETED else result
+                    for result in results
+                ]
+            
+            # One UPDATE for every task's streak
+            new_streaks = {
+                task_id: value if reset else Task.streak + value
+                for task_id, (reset, value) in streak_changes.items()
+            }
+            db.session.execute(
+                update(Task)
+                .where(Task.id.in_(new_streaks))
+                .values(streak=case(new_streaks, value=Task.id))
+            )
+            
+            db.session.execute(
+                insert(TaskCompletion),
+                [{'task_id': task_id, 'completed_at': now} for task_id in completed_task_ids]
+            )
+            
+            TaskService._mark_tasks_changed(user_id)
+            db.session.commit()
+            return results
 
-        occurrence.next_due_at = next_due_at
+    # -- HELPER FUNCTION --
+    # SQL expression for the Monday starting the week of COLUMN
+    @staticmethod
+    def _week_start(column):
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            return func.date(column, 'weekday 0', '-6 days')
+        if dialect == 'mysql':
+            return func.subdate(func.date(column), func.weekday(column))
+        return cast(func.date_trunc('week', column), Date)
 
-        print(occurrence)
+    @staticmethod
+    def get_completion_history(user_id, task_id, before=None, limit=None):
+        """Get a page of a task's completions, newest first
         
-        db.session.commit()
-        return completion
+        Keyset pagination on (completed_at, id), served by the
+        (task_id, completed_at) index: every page costs the same however
+        far back it is.
+        
+        Args:
+            user_id: User ID
+            task_id: Task ID
+            before: Optional (completed_at, id) cursor; only older completions are returned
+            limit: Page size (default HISTORY_PAGE_SIZE)
+        
+        Returns:
+            Tuple of (list of (id, completed_at) rows, cursor of the next page or
+            None), or None if the task is not found
+        """
+        owner = db.session.query(Task.user_id).filter(Task.id == task_id).scalar()
+        if owner is None or owner != user_id:
+            return None
+        
+        limit = limit or TaskService.HISTORY_PAGE_SIZE
+        query = db.session.query(TaskCompletion.id, TaskCompletion.completed_at).filter(
+            TaskCompletion.task_id == task_id
+        )
+        if before is not None:
+            before_at, before_id = before
+            query = query.filter(or_(
+                TaskCompletion.completed_at < before_at,
+                and_(TaskCompletion.completed_at == before_at, TaskCompletion.id < before_id)
+            ))
+        
+        # Fetch one extra row to know whether there is a next page
+        rows = query.order_by(
+            TaskCompletion.completed_at.desc(), TaskCompletion.id.desc()
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1].completed_at, rows[-1].id)
+        return [(completion_id, completed_at) for completion_id, completed_at in rows], next_cursor
+
+    @staticmethod
+    def get_completion_stats(user_id, start, end, group='day', task_id=None):
+        """Count a user's completions per day or per week
+        
+        The counting is a GROUP BY in the database, so only one row per
+        period leaves it whatever the number of completions.
+        
+        Args:
+            user_id: User ID
+            start: Datetime; only completions at or after it are counted
+            end: Datetime; only completions before it are counted
+            group: 'day' or 'week' (weeks start on Monday)
+            task_id: Optional task ID to restrict the counts to
+        
+        Returns:
+            List of (period start date, count) tuples, sorted by period
+        """
+        if group == 'day':
+            period = func.date(TaskCompletion.completed_at)
+        elif group == 'week':
+            period = TaskService._week_start(TaskCompletion.completed_at)
+        else:
+            raise ValueError("group must be 'day' or 'week'")
+        period = period.label('period')
+        
+        query = db.session.query(period, func.count(TaskCompletion.id)).join(Task).filter(
+            Task.user_id == user_id,
+            TaskCompletion.completed_at >= start,
+            TaskCompletion.completed_at < end
+        )
+        if task_id is not None:
+            query = query.filter(TaskCompletion.task_id == task_id)
+        
+        rows = query.group_by(period).order_by(period).all()
+        
+        # SQLite returns dates as strings
+        return [
+            (value if isinstance(value, date) else date.fromisoformat(value), count)
+            for value, count in rows
+        ]
@@ -1,11 +1,16 @@
 from datetime import datetime
 from app.extensions import db
 from app.models import User
+from app.utils.session_manager import evict_identity, revoke_user_sessions
 
 
 class UserService:
     """Business logic for user operations"""
 
+    # Page sizes for get_users_page / iter_users
+    USERS_PAGE_SIZE = 100
+    USERS_MAX_PAGE_SIZE = 500
+
     @staticmethod
     def create_user(email, name=None):
         """Create a new user"""
@@ -95,7 +100,10 @@ class UserService:
             else:
                 raise Exception(f"Cannot update field: {key}")
         
+        # Signed session tokens carry the email, so force them to be re-issued
+        revoke_user_sessions(user_id)
         db.session.commit()
+        evict_identity(user_id)
         return user
 
     @staticmethod
@@ -104,14 +112,50 @@ class UserService:
         user = db.session.get(User, user_id)
         if user:
             db.session.delete(user)
+            revoke_user_sessions(user_id)
             db.session.commit()
+            evict_identity(user_id)
             return True
         return False
 
     @staticmethod
-    def get_all_users():
-        """Get all users"""
-        return User.query.all()
+    def get_users_page(after_id=None, limit=None):
+        """Get a page of users ordered by ID (keyset pagination)
+        
+        Args:
+            after_id: Optional ID; only users with a greater ID are returned
+            limit: Page size (default USERS_PAGE_SIZE)
+        
+        Returns:
+            Tuple of (list of users, after_id of the next page or None)
+        """
+        limit = limit or UserService.USERS_PAGE_SIZE
+        query = User.query
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+        
+        # Fetch one extra row to know whether there is a next page
+        users = query.order_by(User.id).limit(limit + 1).all()
+        if len(users) > limit:
+            users = users[:limit]
+            return users, users[-1].id
+        return users, None
+
+    @staticmethod
+    def iter_users(after_id=None, batch_size=None):
+        """Yield batches of users ordered by ID, each loaded by its own keyset query
+        
+        Each batch is detached from the session once the next one is
+        requested, so memory use is bounded by the batch size.
+        """
+        while True:
+            users, after_id = UserService.get_users_page(after_id, batch_size)
+            if users:
+                yield users
+                for user in users:
+                    db.session.expunge(user)
+            if after_id is None:
+                return
 
     @staticmethod
     def update_user_tokens(user):
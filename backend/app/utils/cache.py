@@ -0,0 +1,144 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheStats:
+    """Hit/miss counters shared by the cache backends (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def record(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """In-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.record('hits')
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        self.stats.record('misses')
+        return None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        self.stats.record('invalidations')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Cache backed by a Redis-compatible client, shared by every worker
+
+    Args:
+        client: Object with Redis' get/set(ex=)/delete methods
+        ttl: Default time to live in seconds
+        prefix: Prefix added to every key
+    """
+
+    def __init__(self, client, ttl=60, prefix='streaks:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key):
+        payload = self.client.get(self.prefix + key)
+        if payload is None:
+            self.stats.record('misses')
+            return None
+        self.stats.record('hits')
+        return pickle.loads(payload)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(
+            self.prefix + key,
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+            ex=self.ttl if ttl is None else ttl
+        )
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+        self.stats.record('invalidations')
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+
+class NullCache:
+    """Cache that stores nothing (TASK_CACHE_BACKEND = 'none')"""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key):
+        self.stats.record('misses')
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+def create_cache(config):
+    """Build the cache backend selected by TASK_CACHE_BACKEND"""
+    backend = config.get('TASK_CACHE_BACKEND', 'memory')
+    ttl = config.get('TASK_CACHE_TTL', 60)
+
+    if backend == 'memory':
+        return LRUCache(max_entries=config.get('TASK_CACHE_MAX_ENTRIES', 1024), ttl=ttl)
+    if backend == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("TASK_CACHE_BACKEND='redis' requires the redis package")
+        return RedisCache(redis.Redis.from_url(config['TASK_CACHE_REDIS_URL']), ttl=ttl)
+    if backend == 'none':
+        return NullCache()
+    raise ValueError(f"Unknown TASK_CACHE_BACKEND: {backend}")
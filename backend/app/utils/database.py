@@ -0,0 +1,74 @@
+import time
+from flask import current_app
+from sqlalchemy import inspect, text
+from app.extensions import db
+
+
+def ensure_indexes():
+    """Create any model-declared index missing from the database"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+
+def normalize_completion_times():
+    """Rewrite completion times SQLite stored without microseconds
+
+    Completions used to take completed_at from the database clock, which
+    SQLite writes as 'YYYY-MM-DD HH:MM:SS'. SQLAlchemy binds datetimes as
+    'YYYY-MM-DD HH:MM:SS.ffffff' and SQLite compares them as strings, so
+    history cursors matched those rows again. Other databases store a real
+    datetime type and need nothing.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    db.session.execute(text(
+        "UPDATE task_completions SET completed_at = completed_at || '.000000' "
+        "WHERE length(completed_at) = 19"
+    ))
+    db.session.commit()
+
+
+def init_db(max_attempts=30, delay=1):
+    """Create missing tables and indexes, waiting for the database to accept connections
+
+    Run once per deploy (`flask init-db`), not in every worker.
+    """
+    for attempt in range(max_attempts):
+        try:
+            db.session.execute(text('SELECT 1'))
+            db.session.rollback()
+            break
+        except Exception as e:
+            db.session.rollback()
+            if attempt == max_attempts - 1:
+                current_app.logger.error(f"Failed to connect to database after {max_attempts} attempts")
+                raise
+            current_app.logger.warning(f"Database connection failed (attempt {attempt + 1}/{max_attempts}): {e}")
+            time.sleep(delay)
+
+    db.create_all()
+    # create_all skips tables that already exist, so add any indexes they are missing
+    ensure_indexes()
+    normalize_completion_times()
+
+
+def check_database():
+    """Check that the database answers and has every table the models need
+
+    One round trip for the ping and one for the table list; never retries.
+
+    Returns:
+        Tuple of (ready, details dict)
+    """
+    try:
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            existing = set(inspect(connection).get_table_names())
+    except Exception as e:
+        return False, {"database": "unavailable", "error": str(e)}
+
+    missing = sorted(set(db.metadata.tables) - existing)
+    if missing:
+        return False, {"database": "ok", "missing_tables": missing}
+    return True, {"database": "ok"}
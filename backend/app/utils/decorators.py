@@ -1,5 +1,6 @@
+import hmac
 from functools import wraps
-from flask import request, jsonify, g
+from flask import current_app, request, jsonify, g
 from app.utils.session_manager import get_current_user
 
 def login_required(f):
@@ -8,7 +9,20 @@ def login_required(f):
         user = get_current_user()
         if user is None:
             return jsonify({"error": "Authentication required"}), 401
-        # Store user in g for easy access if needed, though get_current_user does session lookup
+        # get_current_user() keeps the resolved user in g, so controllers calling it again
+        # don't hit the database; g.current_user is kept for code that reads it directly
         g.current_user = user
         return f(*args, **kwargs)
     return decorated_function
+
+
+def internal_token_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = current_app.config.get('INTERNAL_METRICS_TOKEN')
+        if not token:
+            return jsonify({"error": "Not found"}), 404
+        if not hmac.compare_digest(request.headers.get('X-Internal-Token', ''), token):
+            return jsonify({"error": "Authentication required"}), 401
+        return f(*args, **kwargs)
+    return decorated_function
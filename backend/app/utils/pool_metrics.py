@@ -0,0 +1,82 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Connection pool counters (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def as_dict(self):
+        waits = self.checkouts + self.timeouts
+        return {
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'connects': self.connects,
+            'invalidations': self.invalidations,
+            'wait_ms_avg': round(self.wait_seconds_total / waits * 1000, 3) if waits else 0.0,
+            'wait_ms_max': round(self.wait_seconds_max * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection,
+    how many time out, and how often connections are opened or invalidated
+    (e.g. by pool_pre_ping finding a dropped connection)"""
+
+    def __init__(self, *args, **kwargs):
+        first = '_dispatch' not in kwargs
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        if first:
+            # recreate() hands the listeners on to the new pool, so register them once
+            event.listen(self, 'connect', lambda *args: self.metrics.record('connects'))
+            event.listen(self, 'invalidate', lambda *args: self.metrics.record('invalidations'))
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def status_dict(self):
+        """Current pool gauges plus the counters"""
+        return {
+            'size': self.size(),
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': self.overflow(),
+            **self.metrics.as_dict(),
+        }
@@ -1,16 +1,114 @@
-from flask import session
-from app.models import User
+from collections import namedtuple
+from flask import session, g, current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.models import User, AuthTokenVersion
 from app.extensions import db
 
+# The columns authorization needs; token columns are never loaded on the hot path
+AuthenticatedUser = namedtuple('AuthenticatedUser', ['id', 'email'])
+
+
+def _token_serializer():
+    return URLSafeTimedSerializer(current_app.secret_key, salt='auth-token')
+
+def _issue_auth_token(identity):
+    """Store a signed, expiring claim set for IDENTITY in the session (STATELESS_AUTH)"""
+    session["auth_token"] = _token_serializer().dumps({
+        'id': identity.id,
+        'email': identity.email,
+        'ver': _get_token_version(identity.id),
+    })
+
+def _verify_auth_token(token):
+    """Return the identity in TOKEN if its signature, age and version are valid, else None"""
+    try:
+        claims = _token_serializer().loads(token, max_age=current_app.config.get('AUTH_TOKEN_MAX_AGE', 3600))
+    except BadSignature:  # also raised for expired tokens
+        return None
+    if claims.get('ver') != _get_token_version(claims['id']):
+        return None
+    return AuthenticatedUser(claims['id'], claims['email'])
+
 def create_session(user):
     session["user_id"] = user.id
+    if current_app.config.get('STATELESS_AUTH'):
+        _issue_auth_token(AuthenticatedUser(user.id, user.email))
 
 def clear_session():
     session.pop("user_id", None)
+    session.pop("auth_token", None)
+
+def _get_token_version(user_id):
+    """Get the user's token version through the short-TTL per-process cache"""
+    cache = current_app.extensions['identity_cache']
+    version = cache.get(('token_version', user_id))
+    if version is None:
+        version = db.session.query(AuthTokenVersion.version).filter_by(user_id=user_id).scalar() or 0
+        cache.set(('token_version', user_id), version)
+    return version
+
+def _load_identity(user_id):
+    """Load the user's identity through the short-TTL per-process cache"""
+    cache = current_app.extensions['identity_cache']
+    identity = cache.get(user_id)
+    if identity is None:
+        row = db.session.query(User.id, User.email).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        identity = AuthenticatedUser(*row)
+        cache.set(user_id, identity)
+    return identity
+
+def revoke_user_sessions(user_id):
+    """Invalidate the user's signed session tokens; call before the change's commit"""
+    bumped = db.session.execute(
+        update(AuthTokenVersion)
+        .where(AuthTokenVersion.user_id == user_id)
+        .values(version=AuthTokenVersion.version + 1)
+    ).rowcount
+    if not bumped:
+        try:
+            with db.session.begin_nested():
+                db.session.add(AuthTokenVersion(user_id=user_id, version=1))
+        except IntegrityError:
+            db.session.execute(
+                update(AuthTokenVersion)
+                .where(AuthTokenVersion.user_id == user_id)
+                .values(version=AuthTokenVersion.version + 1)
+            )
+
+def evict_identity(user_id):
+    """Drop a cached identity after the user is changed or deleted"""
+    cache = current_app.extensions['identity_cache']
+    cache.delete(user_id)
+    cache.delete(('token_version', user_id))
 
 def get_current_user():
-    """Get the current authenticated user from session"""
+    """Get the current authenticated user from session (resolved once per request)
+
+    With STATELESS_AUTH a valid signed token is trusted without touching the
+    users table. Expired or revoked tokens fall back to the user_id lookup,
+    which re-issues a token if the user still exists.
+    """
     user_id = session.get("user_id")
     if not user_id:
         return None
-    return db.session.get(User, user_id)
\ No newline at end of file
+    identity = g.get('auth_identity')
+    if identity is not None and identity.id == user_id:
+        return identity
+
+    identity = None
+    stateless = current_app.config.get('STATELESS_AUTH')
+    if stateless and session.get("auth_token"):
+        identity = _verify_auth_token(session["auth_token"])
+        if identity is not None and identity.id != user_id:
+            identity = None
+    if identity is None:
+        identity = _load_identity(user_id)
+        if stateless and identity is not None:
+            _issue_auth_token(identity)
+
+    g.auth_identity = identity
+    return identity
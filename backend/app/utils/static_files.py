@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from collections import namedtuple
+from flask import request, send_file
+
+try:
+    import brotli
+except ImportError:  # Optional: only needed to create .br files
+    brotli = None
+
+
+# Next.js puts content-hashed build output under _next/, so it never changes at a given URL
+IMMUTABLE_PREFIX = '_next/'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# HTML must be revalidated (cheaply, by ETag) so a deploy is picked up immediately
+HTML_CACHE_CONTROL = 'no-cache'
+ASSET_CACHE_CONTROL = 'public, max-age=3600'
+
+# Content-Encoding and file suffix of each precompressed variant, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_EXTENSIONS = {
+    '.html', '.js', '.mjs', '.css', '.json', '.map', '.svg', '.txt', '.xml', '.ico', '.webmanifest',
+}
+MIN_COMPRESS_SIZE = 1024
+
+
+StaticEntry = namedtuple('StaticEntry', ['path', 'mimetype', 'etag', 'cache_control', 'variants'])
+
+
+def _file_etag(path, stat, is_html):
+    if is_html:
+        # Content hash, so unchanged pages keep their ETag across deploys
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:20]
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+class StaticManifest:
+    """In-memory index of the built frontend, made once at startup
+
+    Requests are answered from the index without touching the filesystem
+    until the chosen file is sent, and paths that are not in the index
+    (client-side routes) fall straight through to index.html.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.entries = {}
+        if os.path.isdir(root):
+            self._scan()
+
+    def _scan(self):
+        files = set()
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                files.add(os.path.relpath(os.path.join(directory, name), self.root).replace(os.sep, '/'))
+
+        variant_suffixes = tuple(suffix for _, suffix in ENCODINGS)
+        for relative in files:
+            if relative.endswith(variant_suffixes) and relative.rsplit('.', 1)[0] in files:
+                continue  # A precompressed copy, listed under its original
+
+            path = os.path.join(self.root, relative)
+            stat = os.stat(path)
+            is_html = relative.endswith('.html')
+            etag = _file_etag(path, stat, is_html)
+
+            variants = {}
+            for encoding, suffix in ENCODINGS:
+                if relative + suffix in files:
+                    variants[encoding] = (path + suffix, f"{etag}-{encoding}")
+
+            if relative.startswith(IMMUTABLE_PREFIX):
+                cache_control = IMMUTABLE_CACHE_CONTROL
+            elif is_html:
+                cache_control = HTML_CACHE_CONTROL
+            else:
+                cache_control = ASSET_CACHE_CONTROL
+
+            self.entries[relative] = StaticEntry(
+                path=path,
+                mimetype=mimetypes.guess_type(relative)[0] or 'application/octet-stream',
+                etag=etag,
+                cache_control=cache_control,
+                variants=variants,
+            )
+
+    def get(self, path):
+        """Get the entry for a URL path relative to the frontend root, or None"""
+        return self.entries.get(path)
+
+    def send(self, entry):
+        """Send ENTRY, precompressed if the client accepts one of its variants"""
+        path, etag, encoding = entry.path, entry.etag, None
+        for candidate, _ in ENCODINGS:
+            if candidate in entry.variants and request.accept_encodings[candidate]:
+                path, etag = entry.variants[candidate]
+                encoding = candidate
+                break
+
+        response = send_file(path, mimetype=entry.mimetype, etag=etag, conditional=True)
+        response.headers['Cache-Control'] = entry.cache_control
+        if entry.variants:
+            response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def compress_static(root, min_size=MIN_COMPRESS_SIZE):
+    """Write .gz (and, with the brotli package, .br) copies of compressible files
+
+    Run after each frontend build; copies newer than their original are kept.
+
+    Returns:
+        dict: Number of files written per encoding
+    """
+    written = {encoding: 0 for encoding, _ in ENCODINGS}
+    compressors = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors['br'] = lambda data: brotli.compress(data, quality=11)
+
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            if stat.st_size < min_size:
+                continue
+
+            data = None
+            for encoding, suffix in ENCODINGS:
+                target = path + suffix
+                if encoding not in compressors:
+                    continue
+                if os.path.exists(target) and os.stat(target).st_mtime_ns >= stat.st_mtime_ns:
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                compressed = compressors[encoding](data)
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compressed)
+                written[encoding] += 1
+    return written
@@ -2,11 +2,58 @@ import os
 from authlib.integrations.flask_client import OAuth
 
 
+def engine_options_from_env(environ=os.environ):
+    """SQLAlchemy connection pool settings from DB_POOL_* environment variables
+    
+    The defaults keep 4 gunicorn workers at no more than 40 MySQL connections,
+    recycle connections before MySQL (or Railway's proxy) drops them as idle,
+    and ping on checkout so a dropped connection is replaced instead of
+    failing the first query after an idle period.
+    """
+    return {
+        'pool_size': int(environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(environ.get('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': int(environ.get('DB_POOL_RECYCLE', 280)),
+        'pool_pre_ping': environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
+
 class Config:
     """Base configuration"""
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     DEBUG = False
     TESTING = False
+    # Thread pool size for background calendar export jobs (per process)
+    CALENDAR_EXPORT_WORKERS = int(os.environ.get('CALENDAR_EXPORT_WORKERS', 2))
+    CALENDAR_EXPORT_INLINE = False
+    # Export jobs queued this long, or running without a heartbeat this long, are marked
+    # failed so the user can export again (running jobs beat every third of it)
+    CALENDAR_EXPORT_TIMEOUT_SECONDS = int(os.environ.get('CALENDAR_EXPORT_TIMEOUT_SECONDS', 900))
+    # Google Calendar listing/deletion tuning
+    CALENDAR_PAGE_SIZE = int(os.environ.get('CALENDAR_PAGE_SIZE', 250))
+    CALENDAR_DELETE_CONCURRENCY = int(os.environ.get('CALENDAR_DELETE_CONCURRENCY', 4))
+    # Also search for events created before extended properties were stamped on them
+    CALENDAR_LEGACY_EVENT_SEARCH = os.environ.get('CALENDAR_LEGACY_EVENT_SEARCH', 'true').lower() == 'true'
+    # Read-through cache for grouped task lists: 'memory' (per process), 'redis' (shared) or 'none'
+    TASK_CACHE_BACKEND = os.environ.get('TASK_CACHE_BACKEND', 'memory')
+    TASK_CACHE_TTL = int(os.environ.get('TASK_CACHE_TTL', 60))
+    TASK_CACHE_MAX_ENTRIES = int(os.environ.get('TASK_CACHE_MAX_ENTRIES', 1024))
+    TASK_CACHE_REDIS_URL = os.environ.get('TASK_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # Seconds an authenticated user's identity is cached per process
+    AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', 30))
+    AUTH_CACHE_MAX_ENTRIES = int(os.environ.get('AUTH_CACHE_MAX_ENTRIES', 4096))
+    # Trust a signed, expiring claim set in the session instead of loading the user per request
+    STATELESS_AUTH = os.environ.get('STATELESS_AUTH', 'false').lower() == 'true'
+    AUTH_TOKEN_MAX_AGE = int(os.environ.get('AUTH_TOKEN_MAX_AGE', 3600))
+    # Overdue occurrence rollover: users per transaction, and the optional in-process scheduler
+    ROLLOVER_USER_CHUNK = int(os.environ.get('ROLLOVER_USER_CHUNK', 200))
+    ROLLOVER_SCHEDULER_ENABLED = os.environ.get('ROLLOVER_SCHEDULER_ENABLED', 'false').lower() == 'true'
+    ROLLOVER_INTERVAL_SECONDS = int(os.environ.get('ROLLOVER_INTERVAL_SECONDS', 3600))
+    # Built Next.js frontend (indexed once at startup; run `flask compress-static` after building)
+    FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'frontend')
+    # Shared secret for /internal endpoints (sent as X-Internal-Token); unset disables them
+    INTERNAL_METRICS_TOKEN = os.environ.get('INTERNAL_METRICS_TOKEN')
 
 
 class DevelopmentConfig(Config):
@@ -25,6 +72,9 @@ class TestingConfig(Config):
     SECRET_KEY = 'test-secret-key'
     GOOGLE_CLIENT_ID = 'test-client-id'
     GOOGLE_CLIENT_SECRET = 'test-client-secret'
+    # Run export jobs synchronously so tests can assert on their outcome
+    CALENDAR_EXPORT_INLINE = True
+    INTERNAL_METRICS_TOKEN = 'test-internal-token'
 
 
 class ProductionConfig(Config):
@@ -35,6 +85,7 @@ class ProductionConfig(Config):
     if uri and uri.startswith('mysql://'):
         uri = uri.replace('mysql://', 'mysql+mysqlconnector://', 1)
     SQLALCHEMY_DATABASE_URI = uri
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options_from_env()
     SECRET_KEY = os.environ.get("FLASK_SECRET_KEY")
     GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
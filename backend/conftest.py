@@ -5,6 +5,20 @@ from app.models.user import User
 from datetime import datetime, timedelta
 
 
+def pytest_addoption(parser):
+    parser.addoption('--benchmarks', action='store_true', help='Also run the micro-benchmarks')
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked benchmark unless --benchmarks is given (timings are noisy on shared CI)."""
+    if config.getoption('--benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='micro-benchmark; run with --benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def app():
     """Create application for testing."""
@@ -2,6 +2,7 @@ import os
 import time
 from dotenv import load_dotenv
 from app import create_app
+from app.utils.database import init_db
 
 
 load_dotenv()
@@ -15,4 +16,8 @@ if __name__ == '__main__':
     host = os.environ.get('FLASK_HOST', '0.0.0.0')
     port = int(os.environ.get('FLASK_PORT', os.environ.get('PORT', 5000)))
     
+    # Local runs create the schema themselves; deployments run `flask init-db` once instead
+    with app.app_context():
+        init_db()
+    
     app.run(debug=debug_mode, host=host, port=port)
@@ -1,6 +1,15 @@
 import pytest
+import threading
+import time
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
+from sqlalchemy import event, update
+from app import create_app
+from app.models import CalendarExportJob
 from app.models.user import User
+from app.services.calendar_export_service import CalendarExportService
+from app.extensions import db
+from config import TestingConfig
 
 class TestAuthEndpoints:
     """Tests for auth controller endpoints."""
@@ -57,14 +66,17 @@ class TestAuthEndpoints:
     # POST /calendar/export
     # =====================
 
-    @patch('app.controllers.auth_controller.TaskService.get_user_tasks')
-    @patch('app.controllers.auth_controller.CalendarService.export_all_tasks_to_calendar')
+    @patch('app.services.calendar_export_service.TaskService.get_user_tasks')
+    @patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar')
     def test_calendar_export(self, mock_export, mock_get_tasks, authenticated_client, test_user):
         """Test calendar export success."""
         mock_get_tasks.return_value = {'2023-10-27': []}
         mock_export.return_value = {
             'success': 5,
             'deleted': 2,
+            'created': 3,
+            'updated': 1,
+            'unchanged': 1,
             'failed': 0,
             'errors': [],
             'event_ids': []
@@ -72,14 +84,24 @@ class TestAuthEndpoints:
         
         response = authenticated_client.post('/auth/calendar/export')
         
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data['job_id']
+        assert response.headers['Location'] == data['status_url']
+        
+        response = authenticated_client.get(data['status_url'])
+        
         assert response.status_code == 200
         data = response.get_json()
+        assert data['status'] == 'succeeded'
         assert data['success'] == 5
         assert data['deleted'] == 2
+        assert data['created'] == 3
+        assert data['unchanged'] == 1
         
         mock_get_tasks.assert_called_with(test_user['id'])
         # We can't easily assert the user object passed to export_all_tasks_to_calendar 
-        # because it's fetched inside the view, but we verify the call happened.
+        # because it's fetched inside the job, but we verify the call happened.
         mock_export.assert_called()
 
     def test_calendar_export_unauthenticated(self, client):
@@ -88,26 +110,294 @@ class TestAuthEndpoints:
         
         assert response.status_code == 401
 
-    @patch('app.controllers.auth_controller.TaskService.get_user_tasks')
+    @patch('app.services.calendar_export_service.TaskService.get_user_tasks')
     def test_calendar_export_no_tasks(self, mock_get_tasks, authenticated_client, test_user):
         """Test calendar export with no tasks."""
         mock_get_tasks.return_value = {}
         
         response = authenticated_client.post('/auth/calendar/export')
+        assert response.status_code == 202
+        
+        response = authenticated_client.get(response.get_json()['status_url'])
         
         assert response.status_code == 200
         data = response.get_json()
         assert data['message'] == "No tasks to export"
 
-    @patch('app.controllers.auth_controller.TaskService.get_user_tasks')
-    @patch('app.controllers.auth_controller.CalendarService.export_all_tasks_to_calendar')
+    @patch('app.services.calendar_export_service.TaskService.get_user_tasks')
+    @patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar')
     def test_calendar_export_error(self, mock_export, mock_get_tasks, authenticated_client, test_user):
         """Test calendar export handling exceptions."""
         mock_get_tasks.return_value = {'2023-10-27': []}
         mock_export.side_effect = ValueError("Calendar API Error")
         
         response = authenticated_client.post('/auth/calendar/export')
+        assert response.status_code == 202
         
-        assert response.status_code == 400
+        response = authenticated_client.get(response.get_json()['status_url'])
+        
+        assert response.status_code == 200
         data = response.get_json()
+        assert data['status'] == 'failed'
         assert data['error'] == "Calendar API Error"
+
+    @patch('app.services.calendar_export_service.TaskService.get_user_tasks')
+    def test_calendar_export_status_other_user(self, mock_get_tasks, app, client, test_user, second_test_user):
+        """Test that users cannot read another user's export job."""
+        mock_get_tasks.return_value = {}
+        with client.session_transaction() as sess:
+            sess['user_id'] = test_user['id']
+        status_url = client.post('/auth/calendar/export').get_json()['status_url']
+        
+        with client.session_transaction() as sess:
+            sess['user_id'] = second_test_user['id']
+        response = client.get(status_url)
+        
+        assert response.status_code == 404
+
+    def test_calendar_export_status_not_found(self, authenticated_client):
+        """Test polling an export job that doesn't exist."""
+        response = authenticated_client.get('/auth/calendar/export/does-not-exist')
+        
+        assert response.status_code == 404
+
+    @patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar')
+    def test_calendar_export_returns_running_job(self, mock_export, app, authenticated_client, test_user):
+        """Test that a second export while one is running joins it instead of starting another."""
+        with app.app_context():
+            db.session.add(CalendarExportJob(
+                id='running-job', user_id=test_user['id'],
+                status=CalendarExportJob.RUNNING, created_at=datetime.now()
+            ))
+            db.session.commit()
+        
+        response = authenticated_client.post('/auth/calendar/export')
+        
+        assert response.status_code == 202
+        assert response.get_json()['job_id'] == 'running-job'
+        assert response.get_json()['status'] == 'running'
+        mock_export.assert_not_called()
+        with app.app_context():
+            assert CalendarExportJob.query.filter_by(user_id=test_user['id']).count() == 1
+
+    @patch('app.services.calendar_export_service.TaskService.get_user_tasks')
+    def test_calendar_export_replaces_timed_out_job(self, mock_get_tasks, app, authenticated_client, test_user):
+        """Test that a job abandoned by a restarted worker times out and a new export runs."""
+        mock_get_tasks.return_value = {}
+        timeout = app.config['CALENDAR_EXPORT_TIMEOUT_SECONDS']
+        with app.app_context():
+            db.session.add(CalendarExportJob(
+                id='abandoned-job', user_id=test_user['id'], status=CalendarExportJob.RUNNING,
+                created_at=datetime.now() - timedelta(seconds=timeout + 1)
+            ))
+            db.session.commit()
+        
+        response = authenticated_client.post('/auth/calendar/export')
+        
+        assert response.get_json()['job_id'] != 'abandoned-job'
+        assert response.get_json()['status'] == 'succeeded'
+        abandoned = authenticated_client.get('/auth/calendar/export/abandoned-job').get_json()
+        assert abandoned['status'] == 'failed'
+        assert abandoned['error'] == 'Export timed out'
+
+    def test_calendar_export_status_times_out(self, app, authenticated_client, test_user):
+        """Test that polling a job older than the timeout reports it as failed."""
+        timeout = app.config['CALENDAR_EXPORT_TIMEOUT_SECONDS']
+        with app.app_context():
+            db.session.add(CalendarExportJob(
+                id='stuck-job', user_id=test_user['id'], status=CalendarExportJob.QUEUED,
+                created_at=datetime.now() - timedelta(seconds=timeout + 1)
+            ))
+            db.session.commit()
+        
+        data = authenticated_client.get('/auth/calendar/export/stuck-job').get_json()
+        
+        assert data['status'] == 'failed'
+        assert data['error'] == 'Export timed out'
+
+
+    @patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar')
+    def test_calendar_export_joins_old_job_with_recent_heartbeat(self, mock_export, app, authenticated_client, test_user):
+        """Test that a long-running export that still beats is not timed out."""
+        timeout = app.config['CALENDAR_EXPORT_TIMEOUT_SECONDS']
+        with app.app_context():
+            db.session.add(CalendarExportJob(
+                id='slow-job', user_id=test_user['id'], status=CalendarExportJob.RUNNING,
+                created_at=datetime.now() - timedelta(seconds=timeout * 2), heartbeat_at=datetime.now()
+            ))
+            db.session.commit()
+        
+        response = authenticated_client.post('/auth/calendar/export')
+        
+        assert response.get_json()['job_id'] == 'slow-job'
+        assert response.get_json()['status'] == 'running'
+        mock_export.assert_not_called()
+
+    @patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar')
+    def test_calendar_export_expired_job_does_not_start(self, mock_export, app, test_user):
+        """Test that a job timed out while queued is not run when the pool reaches it."""
+        with app.app_context():
+            db.session.add(CalendarExportJob(
+                id='expired-job', user_id=test_user['id'], status=CalendarExportJob.FAILED,
+                error='Export timed out', created_at=datetime.now()
+            ))
+            db.session.commit()
+            
+            assert CalendarExportService.run_export('expired-job') is None
+            assert db.session.get(CalendarExportJob, 'expired-job').status == 'failed'
+        mock_export.assert_not_called()
+
+    @patch('app.services.calendar_export_service.TaskService.get_user_tasks')
+    @patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar')
+    def test_calendar_export_late_finish_keeps_timeout(self, mock_export, mock_get_tasks, app, authenticated_client, test_user):
+        """Test that an export returning after its job timed out does not overwrite the failure."""
+        mock_get_tasks.return_value = {'2023-10-27': []}
+        
+        def time_out_then_finish(user, tasks_by_date):
+            db.session.execute(
+                update(CalendarExportJob)
+                .where(CalendarExportJob.user_id == test_user['id'])
+                .values(status=CalendarExportJob.FAILED, error='Export timed out')
+            )
+            db.session.commit()
+            return {'success': 1, 'deleted': 0, 'created': 1, 'updated': 0, 'unchanged': 0,
+                    'failed': 0, 'errors': [], 'event_ids': []}
+        mock_export.side_effect = time_out_then_finish
+        
+        data = authenticated_client.post('/auth/calendar/export').get_json()
+        
+        assert data['status'] == 'failed'
+        status = authenticated_client.get(data['status_url']).get_json()
+        assert status['status'] == 'failed'
+        assert status['error'] == 'Export timed out'
+
+    def test_calendar_export_heartbeat_outlives_timeout(self, tmp_path, monkeypatch):
+        """Test that an export running longer than the timeout keeps its job and blocks a second export."""
+        # A file database so the heartbeat thread shares the tables
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'export.db'}")
+        monkeypatch.setattr(TestingConfig, 'CALENDAR_EXPORT_TIMEOUT_SECONDS', 0.3)
+        slow_app = create_app('testing')
+        with slow_app.app_context():
+            db.create_all()
+            user = User(email='slow@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        
+        second_exports = []
+        
+        def enqueue_again():
+            with slow_app.app_context():
+                second_exports.append(CalendarExportService.enqueue_export(user_id).id)
+                db.session.remove()
+        
+        def slow_export(user, tasks_by_date):
+            time.sleep(0.6)
+            thread = threading.Thread(target=enqueue_again)
+            thread.start()
+            thread.join()
+            return {'success': 1, 'deleted': 0, 'created': 1, 'updated': 0, 'unchanged': 0,
+                    'failed': 0, 'errors': [], 'event_ids': []}
+        
+        with slow_app.app_context(), \
+                patch('app.services.calendar_export_service.TaskService.get_user_tasks', return_value={'2023-10-27': []}), \
+                patch('app.services.calendar_service.CalendarService.export_all_tasks_to_calendar', side_effect=slow_export):
+            job = CalendarExportService.enqueue_export(user_id)
+            
+            assert job.status == 'succeeded'
+            assert second_exports == [job.id]
+            assert job.heartbeat_at > job.created_at
+            assert CalendarExportJob.query.count() == 1
+            db.drop_all()
+
+
+class TestAuthenticatedUserLookup:
+    """Tests for resolving the logged-in user in login_required."""
+
+    @staticmethod
+    def count_user_queries(app, request):
+        statements = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            request()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        # Statements that load a user (aggregates that only filter on users.id don't count)
+        return [s for s in statements if 'FROM users' in s and 'users.email' in s]
+
+    def test_user_loaded_once_then_cached(self, app, authenticated_client):
+        """Test that a request loads the user once and later requests reuse it."""
+        first = self.count_user_queries(app, lambda: authenticated_client.post(
+            '/tasks', json={'title': 'Cached', 'frequency': ['mon']}
+        ))
+        second = self.count_user_queries(app, lambda: authenticated_client.get('/tasks'))
+
+        assert len(first) == 1
+        assert 'access_token' not in first[0]
+        assert second == []
+
+    def test_deleted_user_is_evicted(self, app, authenticated_client, test_user):
+        """Test that deleting a user stops its cached identity from authenticating."""
+        assert authenticated_client.get('/tasks').status_code == 200
+
+        authenticated_client.delete(f"/users/{test_user['id']}")
+
+        assert authenticated_client.get('/tasks').status_code == 401
+
+
+class TestStatelessAuth:
+    """Tests for signed session tokens (STATELESS_AUTH)."""
+
+    @pytest.fixture
+    def stateless_client(self, app, client):
+        app.config['STATELESS_AUTH'] = True
+        client.post('/auth/test-login')
+        return client
+
+    def test_token_is_trusted_without_db_lookup(self, app, stateless_client):
+        """Test that a valid token authenticates without querying the users table."""
+        queries = TestAuthenticatedUserLookup.count_user_queries(
+            app, lambda: stateless_client.get('/tasks')
+        )
+
+        assert queries == []
+        with stateless_client.session_transaction() as sess:
+            assert sess['auth_token']
+
+    def test_revoked_token_falls_back_to_database(self, app, stateless_client):
+        """Test that changing the user revokes the token and a fresh one is issued."""
+        with stateless_client.session_transaction() as sess:
+            user_id = sess['user_id']
+            old_token = sess['auth_token']
+
+        stateless_client.put(f'/users/{user_id}', json={'email': 'renamed@example.com'})
+        queries = TestAuthenticatedUserLookup.count_user_queries(
+            app, lambda: stateless_client.get('/tasks')
+        )
+
+        assert len(queries) == 1
+        with stateless_client.session_transaction() as sess:
+            assert sess['auth_token'] != old_token
+
+    def test_expired_token_is_not_trusted(self, app, stateless_client):
+        """Test that an expired token is re-validated against the database."""
+        app.config['AUTH_TOKEN_MAX_AGE'] = -1
+
+        queries = TestAuthenticatedUserLookup.count_user_queries(
+            app, lambda: stateless_client.get('/tasks')
+        )
+
+        assert len(queries) == 1
+
+    def test_deleted_user_token_is_rejected(self, app, stateless_client):
+        """Test that deleting the user revokes its token."""
+        with stateless_client.session_transaction() as sess:
+            user_id = sess['user_id']
+
+        stateless_client.delete(f'/users/{user_id}')
+
+        assert stateless_client.get('/tasks').status_code == 401
@@ -0,0 +1,141 @@
+import pytest
+from unittest.mock import patch
+from app import create_app
+from app.models.user import User
+from app.utils.cache import LRUCache, RedisCache, create_cache
+from app.extensions import db, get_task_cache
+from config import TestingConfig
+
+
+class FakeRedis:
+    """Dict-backed stand-in for a redis.Redis client."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestLRUCache:
+    """Tests for the in-process cache backend."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = LRUCache()
+        cache.get('a')
+        cache.set('a', 1)
+
+        assert cache.get('a') == 1
+        assert cache.stats.as_dict() == {
+            'hits': 1, 'misses': 1, 'invalidations': 0, 'hit_ratio': 0.5
+        }
+
+    def test_entries_expire(self):
+        """Test that entries are not served past their TTL."""
+        cache = LRUCache(ttl=10)
+        with patch('app.utils.cache.time.monotonic', return_value=100):
+            cache.set('a', 1)
+        with patch('app.utils.cache.time.monotonic', return_value=111):
+            assert cache.get('a') is None
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache never grows past max_entries."""
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+
+class TestRedisCache:
+    """Tests for the Redis-compatible cache backend."""
+
+    def test_round_trip(self):
+        """Test that values survive serialization and can be deleted."""
+        cache = RedisCache(FakeRedis())
+        cache.set('a', {'2025-01-06': [{'id': 1}]})
+
+        assert cache.get('a') == {'2025-01-06': [{'id': 1}]}
+        cache.delete('a')
+        assert cache.get('a') is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_unknown_backend(self):
+        """Test that a misconfigured backend fails loudly."""
+        with pytest.raises(ValueError):
+            create_cache({'TASK_CACHE_BACKEND': 'memcached'})
+
+
+class TestTaskListCache:
+    """Tests for the read-through cache in front of TaskService.get_user_tasks."""
+
+    def test_repeated_reads_hit_cache(self, authenticated_client, app):
+        """Test that the second read of an unchanged list is a cache hit."""
+        authenticated_client.get('/tasks')
+        authenticated_client.get('/tasks')
+
+        stats = get_task_cache().stats
+        assert stats.misses == 1
+        assert stats.hits == 1
+
+    def test_writes_invalidate_cache(self, authenticated_client, app):
+        """Test that creating a task is visible on the next read."""
+        assert authenticated_client.get('/tasks').get_json() == {}
+
+        authenticated_client.post('/tasks', json={'title': 'Fresh', 'frequency': ['mon']})
+        data = authenticated_client.get('/tasks').get_json()
+
+        titles = [occ['title'] for occs in data.values() for occ in occs]
+        assert titles == ['Fresh']
+        assert get_task_cache().stats.misses == 2
+
+    def test_write_in_another_worker(self, tmp_path, monkeypatch):
+        """Test that a worker never serves its cached list under a newer version's ETag."""
+        # Two apps on one database file stand in for two gunicorn workers
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'workers.db'}")
+        reader, writer = create_app('testing'), create_app('testing')
+        with reader.app_context():
+            db.create_all()
+            user = User(email='worker@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        clients = []
+        for worker in (reader, writer):
+            client = worker.test_client()
+            with client.session_transaction() as sess:
+                sess['user_id'] = user_id
+            clients.append(client)
+        reader_client, writer_client = clients
+
+        assert reader_client.get('/tasks').get_json() == {}
+        writer_client.post('/tasks', json={'title': 'Elsewhere', 'frequency': ['mon']})
+        response = reader_client.get('/tasks')
+
+        titles = [occ['title'] for occs in response.get_json().values() for occ in occs]
+        assert titles == ['Elsewhere']
+        assert response.headers['ETag'] == writer_client.get('/tasks').headers['ETag']
+        with reader.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        with writer.app_context():
+            db.engine.dispose()
+
+    def test_windowed_reads_bypass_cache(self, authenticated_client, app):
+        """Test that date-windowed reads are not cached."""
+        authenticated_client.get('/tasks?from=2030-01-01')
+
+        assert get_task_cache().stats.as_dict()['hits'] == 0
+        assert get_task_cache().stats.misses == 0
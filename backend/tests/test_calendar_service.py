@@ -0,0 +1,349 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from unittest.mock import patch
+from google.oauth2.credentials import Credentials
+from sqlalchemy import event
+from app.models.task import Task, TaskOccurrences
+from app.models.user import User
+from app.services.calendar_service import CalendarService
+from app.extensions import db
+
+
+class FakeRequest:
+    """Stand-in for a googleapiclient HttpRequest."""
+
+    def __init__(self, handler):
+        self._handler = handler
+
+    def execute(self):
+        return self._handler()
+
+
+class FakeEventsResource:
+    """In-memory implementation of the Calendar events() resource."""
+
+    def __init__(self, calendar):
+        self.calendar = calendar
+
+    def list(self, calendarId, maxResults, pageToken=None, fields=None,
+             privateExtendedProperty=None, q=None):
+        self.calendar.calls.append(('list', pageToken))
+
+        def matches(event):
+            if privateExtendedProperty:
+                key, value = privateExtendedProperty.split('=')
+                private = event.get('extendedProperties', {}).get('private', {})
+                return private.get(key) == value
+            return q in (event.get('description') or '') + (event.get('summary') or '')
+
+        def handler():
+            items = [event for event in self.calendar.stored.values() if matches(event)]
+            start = int(pageToken or 0)
+            result = {'items': items[start:start + maxResults]}
+            if start + maxResults < len(items):
+                result['nextPageToken'] = str(start + maxResults)
+            return result
+        return FakeRequest(handler)
+
+    def insert(self, calendarId, body):
+        self.calendar.calls.append(('insert', body['summary']))
+
+        def handler():
+            self.calendar.next_id += 1
+            event = dict(body, id=f"evt-{self.calendar.next_id}")
+            self.calendar.stored[event['id']] = event
+            return event
+        return FakeRequest(handler)
+
+    def patch(self, calendarId, eventId, body):
+        self.calendar.calls.append(('patch', eventId))
+
+        def handler():
+            event = dict(self.calendar.stored[eventId], **body)
+            self.calendar.stored[eventId] = event
+            return event
+        return FakeRequest(handler)
+
+    def delete(self, calendarId, eventId):
+        self.calendar.calls.append(('delete', eventId))
+
+        def handler():
+            if eventId in self.calendar.failing:
+                raise RuntimeError('boom')
+            del self.calendar.stored[eventId]
+            return ''
+        return FakeRequest(handler)
+
+
+class FakeBatch:
+    """Stand-in for googleapiclient's BatchHttpRequest."""
+
+    def __init__(self, calendar, callback):
+        self.calendar = calendar
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.calendar.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as error:
+                self.callback(request_id, None, error)
+
+
+class FakeCalendar:
+    """Minimal fake of a built Google Calendar service."""
+
+    def __init__(self):
+        self.stored = {}
+        self.calls = []
+        self.batches = []
+        self.failing = set()
+        self.next_id = 0
+
+    def events(self):
+        return FakeEventsResource(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def writes(self):
+        return [call for call in self.calls if call[0] != 'list']
+
+
+def occurrence(occurrence_id, task_id, title, category='General'):
+    return {
+        'id': occurrence_id,
+        'task_id': task_id,
+        'title': title,
+        'category': category,
+    }
+
+
+@pytest.fixture
+def calendar():
+    """Patch the Google client so CalendarService talks to a FakeCalendar."""
+    fake = FakeCalendar()
+    with patch('app.services.calendar_service.CalendarService.get_calendar_credentials'), \
+            patch('app.services.calendar_service.CalendarService.get_service', return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def user(app, test_user):
+    return db.session.get(User, test_user['id'])
+
+
+def create_task_with_occurrences(user_id, title, due_dates):
+    task = Task(user_id=user_id, title=title)
+    db.session.add(task)
+    db.session.flush()
+    for due_date in due_dates:
+        db.session.add(TaskOccurrences(task_id=task.id, frequency='mon', next_due_at=due_date))
+    db.session.commit()
+    return task
+
+
+class TestCalendarSync:
+    """Tests for the incremental Google Calendar sync."""
+
+    def test_initial_sync_inserts_every_occurrence(self, app, calendar, user):
+        """Test that a first sync creates one event per occurrence."""
+        tasks_by_date = {
+            date(2025, 1, 6): [occurrence(1, 1, 'Gym'), occurrence(2, 2, 'Read')],
+            date(2025, 1, 8): [occurrence(3, 1, 'Gym')],
+        }
+
+        result = CalendarService.sync_tasks_to_calendar(user, tasks_by_date)
+
+        assert result['created'] == 3
+        assert result['success'] == 3
+        assert result['deleted'] == 0
+        assert len(calendar.stored) == 3
+        assert len(set(result['event_ids'])) == 3
+
+    def test_resync_without_changes_makes_no_writes(self, app, calendar, user):
+        """Test that syncing unchanged tasks only lists events."""
+        tasks_by_date = {date(2025, 1, 6): [occurrence(1, 1, 'Gym')]}
+        CalendarService.sync_tasks_to_calendar(user, tasks_by_date)
+        calendar.calls.clear()
+
+        result = CalendarService.sync_tasks_to_calendar(user, tasks_by_date)
+
+        assert result['unchanged'] == 1
+        assert result['success'] == 1
+        assert calendar.writes() == []
+
+    def test_resync_patches_changed_and_deletes_removed(self, app, calendar, user):
+        """Test that changed occurrences are patched and removed ones deleted."""
+        CalendarService.sync_tasks_to_calendar(user, {
+            date(2025, 1, 6): [occurrence(1, 1, 'Gym'), occurrence(2, 2, 'Read')],
+        })
+        calendar.calls.clear()
+
+        result = CalendarService.sync_tasks_to_calendar(user, {
+            date(2025, 1, 13): [occurrence(1, 1, 'Gym')],
+            date(2025, 1, 14): [occurrence(4, 3, 'Swim')],
+        })
+
+        assert result['updated'] == 1
+        assert result['created'] == 1
+        assert result['deleted'] == 1
+        assert [call[0] for call in calendar.writes()].count('patch') == 1
+        dates = sorted(event['start']['date'] for event in calendar.stored.values())
+        assert dates == ['2025-01-13', '2025-01-14']
+
+    def test_legacy_events_are_adopted(self, app, calendar, user):
+        """Test that events created before fingerprints existed are patched, not duplicated."""
+        calendar.stored['legacy-1'] = {
+            'id': 'legacy-1',
+            'summary': 'Gym',
+            'description': 'AppTask:1',
+            'start': {'date': '2025-01-06'},
+            'end': {'date': '2025-01-07'},
+        }
+
+        result = CalendarService.sync_tasks_to_calendar(user, {
+            date(2025, 1, 6): [occurrence(1, 1, 'Gym')],
+        })
+
+        assert result['updated'] == 1
+        assert result['created'] == 0
+        assert list(calendar.stored) == ['legacy-1']
+        assert 'AppTask:' not in calendar.stored['legacy-1']['description']
+
+    def test_writes_are_batched(self, app, calendar, user):
+        """Test that writes are sent in batches of at most BATCH_SIZE calls."""
+        tasks_by_date = {
+            date(2025, 1, 6): [occurrence(i, i, f'Task {i}') for i in range(1, 121)],
+        }
+
+        result = CalendarService.sync_tasks_to_calendar(user, tasks_by_date)
+
+        assert result['created'] == 120
+        assert calendar.batches == [50, 50, 20]
+
+    def test_batch_item_failure_is_reported_per_item(self, app, calendar, user):
+        """Test that one failing call in a batch does not fail the others."""
+        calendar.stored['gone'] = {'id': 'gone', 'description': 'AppTask:99'}
+        calendar.failing.add('gone')
+
+        result = CalendarService.sync_tasks_to_calendar(user, {
+            date(2025, 1, 6): [occurrence(1, 1, 'Gym')],
+        })
+
+        assert result['created'] == 1
+        assert result['deleted'] == 0
+        assert result['errors'] == [{'event_id': 'gone', 'error': 'boom'}]
+
+    def test_task_keeps_first_occurrence_event_id(self, app, calendar, user):
+        """Test that each occurrence gets its own event and the task stores the first one."""
+        task = create_task_with_occurrences(
+            user.id, 'Gym', [datetime(2025, 1, 6, 23, 59), datetime(2025, 1, 8, 23, 59)]
+        )
+        occurrence_ids = [occ.id for occ in task.occurrences]
+        tasks_by_date = {
+            date(2025, 1, 6): [occurrence(occurrence_ids[0], task.id, 'Gym')],
+            date(2025, 1, 8): [occurrence(occurrence_ids[1], task.id, 'Gym')],
+        }
+
+        result = CalendarService.sync_tasks_to_calendar(user, tasks_by_date)
+
+        assert len(set(result['event_ids'])) == 2
+        assert db.session.get(Task, task.id).google_event_id == result['event_ids'][0]
+
+    def test_sync_statement_count_does_not_grow_with_occurrences(self, app, calendar, user):
+        """Test that the sync issues a fixed number of SQL statements."""
+        def count_statements(task_count):
+            tasks_by_date = {}
+            for i in range(task_count):
+                task = create_task_with_occurrences(user.id, f'Task {i}', [datetime(2025, 1, 6, 23, 59)])
+                tasks_by_date.setdefault(date(2025, 1, 6), []).append(
+                    occurrence(task.occurrences[0].id, task.id, task.title)
+                )
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                CalendarService.sync_tasks_to_calendar(user, tasks_by_date)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            return len(statements)
+
+        assert count_statements(2) == count_statements(20)
+
+
+class TestCalendarEventListing:
+    """Tests for paged listing and deletion of app-created events."""
+
+    def test_listing_follows_every_page(self, app, calendar, user):
+        """Test that every app event is listed, however many pages it takes."""
+        CalendarService.sync_tasks_to_calendar(user, {
+            date(2025, 1, 6): [occurrence(i, i, f'Task {i}') for i in range(1, 26)],
+        })
+        calendar.stored['foreign'] = {'id': 'foreign', 'summary': 'Dentist'}
+        calendar.calls.clear()
+
+        events = list(CalendarService.iter_app_events(calendar, page_size=10))
+
+        assert len(events) == 25
+        assert 'foreign' not in {event['id'] for event in events}
+        # 3 pages of app events plus the (empty) legacy search
+        assert len(calendar.calls) == 4
+
+    def test_legacy_search_can_be_disabled(self, app, calendar, user):
+        """Test that the description search is skipped when turned off."""
+        calendar.stored['legacy-1'] = {'id': 'legacy-1', 'description': 'AppTask:1'}
+        app.config['CALENDAR_LEGACY_EVENT_SEARCH'] = False
+
+        events = list(CalendarService.iter_app_events(calendar))
+
+        assert events == []
+
+    def test_sync_deletes_stale_events_from_every_page(self, app, calendar, user):
+        """Test that removed occurrences' events are found on every page and deleted in concurrent batches."""
+        CalendarService.sync_tasks_to_calendar(user, {
+            date(2025, 1, 6): [occurrence(i, i, f'Task {i}') for i in range(1, 131)],
+        })
+        calendar.stored['foreign'] = {'id': 'foreign', 'summary': 'Dentist'}
+        calendar.batches.clear()
+        app.config['CALENDAR_PAGE_SIZE'] = 40
+
+        with patch('app.services.calendar_service.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pool:
+            result = CalendarService.sync_tasks_to_calendar(user, {
+                date(2025, 1, 6): [occurrence(1, 1, 'Task 1')],
+            })
+
+        assert result['deleted'] == 129
+        assert result['unchanged'] == 1
+        assert sorted(calendar.batches) == [29, 50, 50]
+        assert pool.call_args.kwargs['max_workers'] == 3
+        assert sorted(calendar.stored) == ['evt-1', 'foreign']
+
+
+class TestCalendarServiceFactory:
+    """Tests for the cached Google Calendar service factory."""
+
+    def test_service_is_reused_per_token(self):
+        """Test that the same access token gets the same built service."""
+        first = CalendarService.get_service(Credentials(token='token-a'))
+        second = CalendarService.get_service(Credentials(token='token-a'))
+        other = CalendarService.get_service(Credentials(token='token-b'))
+
+        assert first is second
+        assert other is not first
+        assert hasattr(first, 'events')
+
+    def test_discovery_document_is_parsed_once(self):
+        """Test that building services does not re-read the discovery document."""
+        CalendarService.get_service(Credentials(token='token-c'))
+
+        with patch('app.services.calendar_service.discovery_cache.get_static_doc') as mock_doc:
+            CalendarService.get_service(Credentials(token='token-d'))
+
+        mock_doc.assert_not_called()
@@ -7,6 +7,7 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from app import create_app
 from app.extensions import db
+from app.utils.database import init_db
 
 # Configure port for the test server
 TEST_PORT = 5000
@@ -16,6 +17,8 @@ TEST_SERVER_URL = f'http://localhost:{TEST_PORT}'
 def live_server():
     """Run the Flask app in a separate thread for E2E testing."""
     app = create_app('testing')
+    with app.app_context():
+        init_db()
     
     # Disable reloader and debugger for the thread
     app.debug = False
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import pytest
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for slow CI machines, tight enough to catch a heavy new top-level import
+IMPORT_TIME_BUDGET_MS = int(os.environ.get('IMPORT_TIME_BUDGET_MS', 2500))
+
+
+def run_python(code, *flags):
+    """Run CODE in a fresh interpreter, as a worker would on boot."""
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def cumulative_import_ms(importtime_output, module):
+    """Cumulative import time of MODULE from `python -X importtime` output."""
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+class TestImportTime:
+    """Tests that booting a worker stays cheap."""
+
+    def test_create_app_does_not_import_heavy_libraries(self):
+        """Test that the Google API client libraries and NumPy are only imported on first use."""
+        result = run_python(
+            "import sys\n"
+            "from app import create_app\n"
+            "create_app('testing')\n"
+            "loaded = sorted(m for m in sys.modules if m.split('.')[0] in ('google', 'googleapiclient', 'httplib2', 'numpy'))\n"
+            "print('loaded:' + ','.join(loaded))"
+        )
+
+        assert 'loaded:\n' in result.stdout + '\n'
+
+    def test_app_import_time_budget(self):
+        """Test that importing the app stays within the import time budget."""
+        result = run_python('from app import create_app', '-X', 'importtime')
+
+        assert cumulative_import_ms(result.stderr, 'app') < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,156 @@
+import pytest
+from sqlalchemy import create_engine, exc, inspect, text
+from app import create_app
+from app.extensions import db
+from app.utils.pool_metrics import InstrumentedQueuePool
+from config import TestingConfig, engine_options_from_env
+
+
+HEADERS = {'X-Internal-Token': TestingConfig.INTERNAL_METRICS_TOKEN}
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /internal/metrics."""
+
+    def test_requires_token(self, client):
+        """Test that the endpoint rejects requests without the internal token."""
+        assert client.get('/internal/metrics').status_code == 401
+        assert client.get('/internal/metrics', headers={'X-Internal-Token': 'wrong'}).status_code == 401
+
+    def test_disabled_without_configured_token(self, app, client):
+        """Test that the endpoint does not exist unless a token is configured."""
+        app.config['INTERNAL_METRICS_TOKEN'] = None
+
+        assert client.get('/internal/metrics', headers=HEADERS).status_code == 404
+
+    def test_reports_cache_stats(self, authenticated_client):
+        """Test that task list cache hits and misses are reported."""
+        authenticated_client.get('/tasks')
+        authenticated_client.get('/tasks?from=2030-01-01')
+        authenticated_client.get('/tasks')
+
+        data = authenticated_client.get('/internal/metrics', headers=HEADERS).get_json()
+
+        assert data['caches']['task_cache']['hits'] == 1
+        assert data['caches']['task_cache']['misses'] == 1
+        assert 'identity_cache' in data['caches']
+
+    def test_reports_pool_metrics(self, tmp_path, monkeypatch):
+        """Test that a configured pool is instrumented and reported."""
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'pool.db'}")
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', engine_options_from_env({}), raising=False)
+        pooled_app = create_app('testing')
+
+        response = pooled_app.test_client().get('/internal/metrics', headers=HEADERS)
+
+        pool = response.get_json()['pool']
+        assert pool['class'] == 'InstrumentedQueuePool'
+        assert pool['size'] == 5
+        assert pool['checkouts'] >= 1
+        with pooled_app.app_context():
+            db.engine.dispose()
+
+
+class TestPoolConfiguration:
+    """Tests for the connection pool settings and instrumentation."""
+
+    def test_engine_options_defaults(self):
+        """Test the pool settings used when no variables are set."""
+        assert engine_options_from_env({}) == {
+            'pool_size': 5,
+            'max_overflow': 5,
+            'pool_timeout': 10,
+            'pool_recycle': 280,
+            'pool_pre_ping': True,
+        }
+
+    def test_engine_options_from_env(self):
+        """Test that every pool setting can be overridden."""
+        options = engine_options_from_env({
+            'DB_POOL_SIZE': '2',
+            'DB_MAX_OVERFLOW': '0',
+            'DB_POOL_TIMEOUT': '3',
+            'DB_POOL_RECYCLE': '60',
+            'DB_POOL_PRE_PING': 'false',
+        })
+
+        assert options == {
+            'pool_size': 2,
+            'max_overflow': 0,
+            'pool_timeout': 3,
+            'pool_recycle': 60,
+            'pool_pre_ping': False,
+        }
+
+    def test_instrumented_pool_counts_waits_and_timeouts(self, tmp_path):
+        """Test that checkouts, timeouts and invalidations are counted."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'metrics.db'}",
+            poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+        )
+        held = engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        held.invalidate()
+        held.close()
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+        metrics = engine.pool.metrics.as_dict()
+        assert metrics['checkouts'] == 2
+        assert metrics['timeouts'] == 1
+        assert metrics['connects'] == 2
+        assert metrics['invalidations'] == 1
+        assert metrics['wait_ms_max'] >= 50
+
+        engine.dispose()
+        assert engine.pool.metrics.as_dict()['checkouts'] == 2
+
+
+class TestHealthEndpoints:
+    """Tests for /healthz, /readyz and the init-db command."""
+
+    @pytest.fixture
+    def empty_app(self, tmp_path, monkeypatch):
+        """App on a database whose schema has not been created yet."""
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'empty.db'}")
+        empty_app = create_app('testing')
+        yield empty_app
+        with empty_app.app_context():
+            db.engine.dispose()
+
+    def test_healthz(self, client):
+        """Test that liveness does not depend on the database."""
+        response = client.get('/healthz')
+
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'ok'}
+
+    def test_readyz_when_schema_exists(self, client):
+        """Test that readiness passes once the schema has been created."""
+        response = client.get('/readyz')
+
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'ready', 'database': 'ok'}
+
+    def test_readyz_before_init_db(self, empty_app):
+        """Test that readiness fails and names the missing tables until init-db has run."""
+        response = empty_app.test_client().get('/readyz')
+
+        assert response.status_code == 503
+        assert 'users' in response.get_json()['missing_tables']
+
+    def test_create_app_does_not_create_schema(self, empty_app):
+        """Test that creating the app leaves schema creation to init-db."""
+        with empty_app.app_context():
+            assert inspect(db.engine).get_table_names() == []
+
+    def test_init_db_command(self, empty_app):
+        """Test that `flask init-db` creates every table and index."""
+        result = empty_app.test_cli_runner().invoke(args=['init-db'])
+
+        assert result.exit_code == 0
+        assert empty_app.test_client().get('/readyz').status_code == 200
+        with empty_app.app_context():
+            indexes = {index['name'] for index in inspect(db.engine).get_indexes('tasks')}
+        assert 'ix_tasks_user_id' in indexes
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event, text
+from app.utils.database import ensure_indexes
+from app.extensions import db
+from app.models import TaskOccurrences
+from app.services.task_service import TaskService
+
+
+def query_plan(statement, **params):
+    """Return SQLite's EXPLAIN QUERY PLAN output as one string."""
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}"), params).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+def sent_query_plans(action, table):
+    """Run action and return the query plans of the SELECTs it sent that read table.
+
+    The statements are captured as the ORM sends them to the database, with
+    their parameters, so the plans follow any change to the service queries.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        action()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    connection = db.session.connection()
+    plans = []
+    for statement, parameters in statements:
+        if statement.lstrip().upper().startswith('SELECT') and f"FROM {table}" in statement:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append(' | '.join(row[-1] for row in rows))
+    assert plans, f"no SELECT from {table} was sent"
+    return plans
+
+
+@pytest.fixture
+def task(app, test_user):
+    """A task of test_user with a few completions."""
+    task = TaskService.create_task(test_user['id'], 'Gym', ['mon', 'thu'])
+    for _ in range(3):
+        occurrence = TaskOccurrences.query.filter_by(task_id=task.id).order_by(TaskOccurrences.next_due_at).first()
+        TaskService.complete_task(test_user['id'], occurrence.id)
+    return task
+
+
+class TestQueryPlans:
+    """Tests that the hot task queries the services send are served by indexes."""
+
+    def test_indexes_exist(self, app):
+        """Test that the schema has the composite indexes."""
+        names = {row[0] for row in db.session.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        )}
+
+        assert {
+            'ix_tasks_user_id',
+            'ix_task_occurrences_task_id_next_due_at',
+            'ix_task_completions_task_id_completed_at',
+        } <= names
+
+    def test_ensure_indexes_adds_missing_index(self, app):
+        """Test that indexes are added to tables that already exist."""
+        db.session.execute(text("DROP INDEX ix_tasks_user_id"))
+        db.session.commit()
+
+        ensure_indexes()
+
+        assert 'ix_tasks_user_id' in query_plan(
+            "SELECT id FROM tasks WHERE user_id = :user_id", user_id=1
+        )
+
+    def test_user_tasks_query_uses_indexes(self, task, test_user):
+        """Test that listing a user's occurrences uses both indexes."""
+        [plan] = sent_query_plans(
+            lambda: TaskService.get_user_tasks(test_user['id'], version=0), 'task_occurrences'
+        )
+
+        assert 'ix_tasks_user_id' in plan
+        assert 'ix_task_occurrences_task_id_next_due_at' in plan
+
+    def test_user_tasks_window_uses_due_date_index(self, task, test_user):
+        """Test that a date window is a range search on the occurrence index."""
+        start = datetime.now()
+        [plan] = sent_query_plans(
+            lambda: TaskService.get_user_tasks(test_user['id'], start=start, end=start + timedelta(days=7)),
+            'task_occurrences',
+        )
+
+        assert 'ix_tasks_user_id' in plan
+        assert 'ix_task_occurrences_task_id_next_due_at (task_id=? AND next_due_at>' in plan
+
+    def test_complete_task_earliest_check_uses_index(self, task, test_user):
+        """Test that completing checks for an earlier occurrence from the index."""
+        occurrence = TaskOccurrences.query.filter_by(task_id=task.id).order_by(TaskOccurrences.next_due_at.desc()).first()
+
+        [plan] = sent_query_plans(
+            lambda: TaskService.complete_task(test_user['id'], occurrence.id), 'task_occurrences'
+        )
+
+        assert 'COVERING INDEX ix_task_occurrences_task_id_next_due_at (task_id=? AND next_due_at<?)' in plan
+        assert 'SCAN' not in plan
+
+    def test_complete_tasks_uses_indexes(self, task, test_user):
+        """Test that a batch completion reads the affected tasks' occurrences from the index."""
+        occurrence = TaskOccurrences.query.filter_by(task_id=task.id).first()
+
+        plans = sent_query_plans(
+            lambda: TaskService.complete_tasks(test_user['id'], [occurrence.id]), 'task_occurrences'
+        )
+
+        assert any('ix_task_occurrences_task_id_next_due_at (task_id=?)' in plan for plan in plans)
+        assert not any('SCAN' in plan for plan in plans)
+
+    def test_completion_history_uses_index(self, task, test_user):
+        """Test that the first page of history is read in order from the index."""
+        [plan] = sent_query_plans(
+            lambda: TaskService.get_completion_history(test_user['id'], task.id), 'task_completions'
+        )
+
+        assert 'ix_task_completions_task_id_completed_at' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_completion_history_page_uses_index(self, task, test_user):
+        """Test that a keyset page of history is read from the index without sorting."""
+        [plan] = sent_query_plans(
+            lambda: TaskService.get_completion_history(test_user['id'], task.id, before=(datetime.now(), 10)),
+            'task_completions',
+        )
+
+        assert 'ix_task_completions_task_id_completed_at' in plan
+        assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,109 @@
+import pytest
+import threading
+from datetime import datetime
+from unittest.mock import patch
+from app.models.task import Task, TaskOccurrences
+from app.models.user import User
+from app.services.rollover_service import RolloverService, start_rollover_scheduler, stop_rollover_scheduler
+from app.services.task_service import TaskService
+from app.extensions import db
+
+
+# A Wednesday
+NOW = datetime(2025, 3, 12, 10, 0)
+
+
+def create_task(user_id, streak, occurrences):
+    task = Task(user_id=user_id, title='Task', streak=streak)
+    db.session.add(task)
+    db.session.flush()
+    for frequency, due_at in occurrences:
+        db.session.add(TaskOccurrences(task_id=task.id, frequency=frequency, next_due_at=due_at))
+    db.session.commit()
+    return task
+
+
+def create_user(index):
+    user = User(email=f"user{index}@example.com", name=f"User {index}", google_id=f"google-{index}")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+class TestOverdueSweep:
+    """Tests for the overdue occurrence rollover and streak reset."""
+
+    def test_overdue_occurrences_roll_forward(self, app, test_user):
+        """Test that overdue occurrences move to their next weekday on or after today."""
+        task = create_task(test_user['id'], 4, [
+            ('mon', datetime(2025, 3, 10, 23, 59, 59)),
+            ('wed', datetime(2025, 3, 5, 23, 59, 59)),
+        ])
+
+        totals = RolloverService.sweep_overdue(now=NOW)
+
+        assert totals == {'users': 1, 'occurrences': 2, 'tasks': 1}
+        due_dates = sorted(occ.next_due_at for occ in db.session.get(Task, task.id).occurrences)
+        assert due_dates == [datetime(2025, 3, 12, 23, 59, 59), datetime(2025, 3, 17, 23, 59, 59)]
+        assert db.session.get(Task, task.id).streak == 0
+
+    def test_tasks_on_schedule_are_untouched(self, app, test_user):
+        """Test that tasks without overdue occurrences keep their dates and streak."""
+        due_at = datetime(2025, 3, 14, 23, 59, 59)
+        task = create_task(test_user['id'], 7, [('fri', due_at)])
+
+        totals = RolloverService.sweep_overdue(now=NOW)
+
+        assert totals == {'users': 0, 'occurrences': 0, 'tasks': 0}
+        task = db.session.get(Task, task.id)
+        assert task.streak == 7
+        assert task.occurrences[0].next_due_at == due_at
+
+    def test_users_are_swept_in_chunks(self, app):
+        """Test that every user is swept when there are more users than the chunk size."""
+        task_ids = []
+        for index in range(5):
+            user = create_user(index)
+            task_ids.append(create_task(user.id, 3, [('mon', datetime(2025, 3, 3, 23, 59, 59))]).id)
+
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as mock_commit:
+            totals = RolloverService.sweep_overdue(now=NOW, chunk_size=2)
+            commits = mock_commit.call_count
+
+        assert totals == {'users': 5, 'occurrences': 5, 'tasks': 5}
+        assert commits == 3
+        assert all(db.session.get(Task, task_id).streak == 0 for task_id in task_ids)
+
+    def test_sweep_invalidates_cached_task_lists(self, app, test_user):
+        """Test that the sweep bumps the task list version and drops the cached list."""
+        create_task(test_user['id'], 2, [('mon', datetime(2025, 3, 10, 23, 59, 59))])
+        TaskService.get_user_tasks(test_user['id'])
+        version = TaskService.get_tasks_version(test_user['id'])
+
+        RolloverService.sweep_overdue(now=NOW)
+
+        assert TaskService.get_tasks_version(test_user['id']) == version + 1
+        occurrences = [occ for day in TaskService.get_user_tasks(test_user['id']).values() for occ in day]
+        assert occurrences[0]['next_due_at'] == datetime(2025, 3, 17, 23, 59, 59)
+        assert occurrences[0]['streak'] == 0
+
+    def test_cli_command(self, app, test_user):
+        """Test that `flask sweep-overdue` runs the sweep."""
+        create_task(test_user['id'], 2, [('mon', datetime(2000, 1, 3, 23, 59, 59))])
+
+        result = app.test_cli_runner().invoke(args=['sweep-overdue', '--chunk-size', '10'])
+
+        assert result.exit_code == 0
+        assert 'Swept 1 overdue occurrences (1 streaks reset) for 1 users' in result.output
+
+    def test_scheduler_runs_sweep_periodically(self, app):
+        """Test that the scheduler thread calls the sweep until stopped."""
+        app.config['ROLLOVER_INTERVAL_SECONDS'] = 0.01
+        swept = threading.Event()
+
+        with patch.object(RolloverService, 'sweep_overdue', side_effect=lambda: swept.set()):
+            start_rollover_scheduler(app)
+            try:
+                assert swept.wait(5)
+            finally:
+                stop_rollover_scheduler()
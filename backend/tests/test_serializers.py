@@ -0,0 +1,143 @@
+import os
+import timeit
+from datetime import date, datetime
+import pytest
+from flask import json, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
+from app.extensions import db
+from app.models import Task, TaskSummary, User
+from app.schemas import (
+    FastSerializer, TaskCompletionSchema, task_schema, task_serializer,
+    task_summary_schema, task_summary_serializer, user_schema, user_serializer,
+)
+
+
+# The precompiled path must beat marshmallow by at least this factor on a list dump
+MIN_SPEEDUP = float(os.environ.get('SERIALIZER_MIN_SPEEDUP', 3))
+
+
+def make_users(count):
+    return [
+        User(
+            id=i, email=f"user{i}@example.com", name=f"User {i}", google_id=str(i),
+            created_at=datetime(2025, 1, 1, 12, 30), access_token='token', refresh_token=None,
+            token_expiry=datetime(2025, 1, 2) if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def benchmark(fast, slow, number=20):
+    """Best-of-three seconds for each of two callables."""
+    return (
+        min(timeit.repeat(fast, number=number, repeat=3)),
+        min(timeit.repeat(slow, number=number, repeat=3)),
+    )
+
+
+class TestFastSerializer:
+    """Tests that the precompiled serializers match the marshmallow schemas."""
+
+    def test_user_matches_schema(self):
+        """Test that users dump identically, including unset columns."""
+        for user in make_users(2):
+            assert user_serializer.dump(user) == user_schema.dump(user)
+
+    def test_task_matches_schema(self, app, test_user):
+        """Test that tasks dump identically, including the user_id foreign key."""
+        task = Task(user_id=test_user['id'], title='Run', category='Fitness')
+        db.session.add(task)
+        db.session.commit()
+
+        assert task_serializer.dump(task) == task_schema.dump(task)
+        assert task_serializer.dump(task)['user_id'] == test_user['id']
+
+    def test_summary_matches_schema(self):
+        """Test that Date columns dump as ISO dates."""
+        summary = TaskSummary(
+            user_id=1, as_of=date(2025, 3, 4), total_tasks=3, due_today=1,
+            overdue=0, best_streak=7, completions_this_week=2,
+        )
+
+        assert task_summary_serializer.dump(summary) == task_summary_schema.dump(summary)
+
+    def test_explicit_datetime_format(self):
+        """Test that a schema's datetime format is honoured."""
+        completion = type('Completion', (), {'id': 1, 'task_id': 2, 'completed_at': datetime(2025, 3, 4, 5, 6, 7, 891)})()
+
+        serializer = FastSerializer(TaskCompletionSchema())
+
+        assert serializer.dump(completion) == TaskCompletionSchema().dump(completion)
+        assert serializer.dump(completion)['completed_at'] == '2025-03-04T05:06:07'
+
+    def test_dump_many(self):
+        """Test that dump_many matches dumping with many=True."""
+        users = make_users(5)
+
+        assert user_serializer.dump_many(users) == user_schema.dump(users, many=True)
+
+
+class TestJSONProvider:
+    """Tests that the orjson provider keeps Flask's JSON output."""
+
+    def test_matches_default_provider(self, app):
+        """Test that a dumped page decodes to the same data as with the stdlib provider."""
+        data = {'users': user_serializer.dump_many(make_users(3)), 'next_after_id': 3}
+
+        assert json.loads(app.json.dumps(data)) == json.loads(DefaultJSONProvider(app).dumps(data))
+
+    def test_sorts_keys_and_keeps_http_dates(self, app):
+        """Test key order and datetime encoding match the default provider."""
+        data = {'b': 1, 'a': datetime(2025, 1, 2, 3, 4, 5), 'c': [date(2025, 1, 2)]}
+
+        with app.app_context():
+            assert json.dumps(data) == DefaultJSONProvider(app).dumps(data, separators=(',', ':'))
+            assert list(json.loads(json.dumps(data))) == ['a', 'b', 'c']
+
+    def test_response_round_trip(self, authenticated_client):
+        """Test that API responses are compact JSON the client can parse."""
+        authenticated_client.post('/tasks', json={'title': 'Café', 'frequency': 'MON'})
+
+        response = authenticated_client.get('/tasks')
+
+        assert response.mimetype == 'application/json'
+        assert response.data.endswith(b'\n')
+        occurrences = next(iter(response.get_json().values()))
+        assert occurrences[0]['title'] == 'Café'
+
+    def test_invalid_json_is_a_bad_request(self, app):
+        """Test that malformed request bodies are still rejected as bad requests."""
+        with app.test_request_context('/', data='{nope', content_type='application/json'):
+            with pytest.raises(BadRequest):
+                request.get_json()
+
+
+@pytest.mark.benchmark
+class TestSerializationBenchmarks:
+    """Micro-benchmarks of the fast paths against what they replaced (pytest --benchmarks -s)."""
+
+    def test_faster_than_schema(self):
+        """Micro-benchmark: dumping a page of users against marshmallow."""
+        users = make_users(500)
+
+        fast, slow = benchmark(
+            lambda: user_serializer.dump_many(users),
+            lambda: user_schema.dump(users, many=True),
+        )
+
+        print(f"\n500 users x20: FastSerializer {fast * 1000:.1f} ms, UserSchema {slow * 1000:.1f} ms ({slow / fast:.1f}x)")
+        assert slow / fast >= MIN_SPEEDUP
+
+    def test_faster_than_default_provider(self, app):
+        """Micro-benchmark: encoding a page of dumped users against the stdlib provider."""
+        data = {'users': user_serializer.dump_many(make_users(500)), 'next_after_id': 500}
+        default = DefaultJSONProvider(app)
+
+        fast, slow = benchmark(
+            lambda: app.json.dumps(data),
+            lambda: default.dumps(data, separators=(',', ':')),
+        )
+
+        print(f"\n500 users x20: OrjsonProvider {fast * 1000:.1f} ms, DefaultJSONProvider {slow * 1000:.1f} ms ({slow / fast:.1f}x)")
+        assert slow / fast >= MIN_SPEEDUP
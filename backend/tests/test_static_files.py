@@ -0,0 +1,172 @@
+import gzip
+import os
+import pytest
+from app import create_app
+from app.extensions import db
+from app.utils.static_files import IMMUTABLE_CACHE_CONTROL, HTML_CACHE_CONTROL, compress_static
+from config import TestingConfig
+
+
+INDEX_HTML = b'<html><body>' + b'index ' * 400 + b'</body></html>'
+CHUNK_JS = b'console.log("chunk");\n' * 100
+
+
+def write(root, relative, data):
+    path = os.path.join(root, *relative.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture
+def frontend_dir(tmp_path):
+    """A small Next.js-style export with precompressed variants of the chunk."""
+    root = str(tmp_path / 'frontend')
+    write(root, 'index.html', INDEX_HTML)
+    write(root, 'signin.html', b'<html>signin</html>')
+    write(root, '_next/static/chunks/app-1a2b3c.js', CHUNK_JS)
+    write(root, '_next/static/chunks/app-1a2b3c.js.gz', gzip.compress(CHUNK_JS))
+    # The brotli package is optional, so stand in for a real .br file
+    write(root, '_next/static/chunks/app-1a2b3c.js.br', b'brotli-bytes')
+    write(root, 'favicon.ico', b'\x00\x00\x01\x00')
+    return root
+
+
+@pytest.fixture
+def static_client(frontend_dir, monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'FRONTEND_DIR', frontend_dir)
+    static_app = create_app('testing')
+    yield static_app.test_client()
+    with static_app.app_context():
+        db.engine.dispose()
+
+
+class TestStaticFrontend:
+    """Tests for serving the built frontend from the startup manifest."""
+
+    def test_hashed_assets_are_immutable(self, static_client):
+        """Test that _next/ assets are cached for a year."""
+        response = static_client.get('/_next/static/chunks/app-1a2b3c.js')
+
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+        assert response.mimetype in ('application/javascript', 'text/javascript')
+
+    def test_prefers_brotli(self, static_client):
+        """Test that the .br variant is sent when the client accepts it."""
+        response = static_client.get(
+            '/_next/static/chunks/app-1a2b3c.js', headers={'Accept-Encoding': 'gzip, br'}
+        )
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.data == b'brotli-bytes'
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_falls_back_to_gzip(self, static_client):
+        """Test that the .gz variant is sent to clients without brotli."""
+        response = static_client.get(
+            '/_next/static/chunks/app-1a2b3c.js', headers={'Accept-Encoding': 'gzip'}
+        )
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == CHUNK_JS
+
+    def test_identity_without_accept_encoding(self, static_client):
+        """Test that the original file is sent when no encoding is accepted."""
+        response = static_client.get('/_next/static/chunks/app-1a2b3c.js')
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.data == CHUNK_JS
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_variants_get_distinct_etags(self, static_client):
+        """Test that a cached gzip body is never revalidated as the identity one."""
+        plain = static_client.get('/_next/static/chunks/app-1a2b3c.js')
+        gzipped = static_client.get(
+            '/_next/static/chunks/app-1a2b3c.js', headers={'Accept-Encoding': 'gzip'}
+        )
+
+        assert plain.headers['ETag'] != gzipped.headers['ETag']
+
+    def test_html_revalidates_by_etag(self, static_client):
+        """Test that HTML must be revalidated and answers 304 when unchanged."""
+        response = static_client.get('/')
+
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == HTML_CACHE_CONTROL
+        assert response.data == INDEX_HTML
+
+        revalidated = static_client.get('/', headers={'If-None-Match': response.headers['ETag']})
+
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+
+    def test_signin_page(self, static_client):
+        """Test that /signin serves the exported signin page."""
+        response = static_client.get('/signin')
+
+        assert response.status_code == 200
+        assert response.data == b'<html>signin</html>'
+
+    def test_other_files_get_short_cache(self, static_client):
+        """Test that unhashed assets are cached briefly."""
+        response = static_client.get('/favicon.ico')
+
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'public, max-age=3600'
+
+    def test_client_side_routes_fall_back_to_index(self, static_client):
+        """Test that unknown paths are served index.html for the SPA router."""
+        response = static_client.get('/tasks/42/edit')
+
+        assert response.status_code == 200
+        assert response.data == INDEX_HTML
+
+    def test_api_paths_are_not_served(self, static_client):
+        """Test that unmatched api/ paths are a 404 rather than index.html."""
+        assert static_client.get('/api/unknown').status_code == 404
+
+    def test_missing_frontend(self, tmp_path, monkeypatch):
+        """Test the 404s when the frontend has not been built."""
+        monkeypatch.setattr(TestingConfig, 'FRONTEND_DIR', str(tmp_path / 'missing'))
+        client = create_app('testing').test_client()
+
+        assert client.get('/').get_json() == {'error': 'Frontend not built'}
+        assert client.get('/some/route').status_code == 404
+
+
+class TestCompressStatic:
+    """Tests for compress_static and the compress-static command."""
+
+    def test_writes_gzip_for_large_text_files(self, tmp_path):
+        """Test that only large, compressible files get a .gz copy."""
+        root = str(tmp_path)
+        big = write(root, '_next/app.js', CHUNK_JS)
+        small = write(root, 'small.css', b'body{}')
+        image = write(root, 'logo.png', b'\x89PNG' * 1000)
+
+        written = compress_static(root)
+
+        assert written['gzip'] == 1
+        with open(big + '.gz', 'rb') as f:
+            assert gzip.decompress(f.read()) == CHUNK_JS
+        assert not os.path.exists(small + '.gz')
+        assert not os.path.exists(image + '.gz')
+
+    def test_skips_up_to_date_copies(self, tmp_path):
+        """Test that rerunning does not rewrite copies newer than their original."""
+        write(str(tmp_path), 'app.js', CHUNK_JS)
+        compress_static(str(tmp_path))
+
+        assert compress_static(str(tmp_path))['gzip'] == 0
+
+    def test_command(self, frontend_dir, monkeypatch):
+        """Test that `flask compress-static` compresses the configured frontend."""
+        monkeypatch.setattr(TestingConfig, 'FRONTEND_DIR', frontend_dir)
+        cli_app = create_app('testing')
+
+        result = cli_app.test_cli_runner().invoke(args=['compress-static'])
+
+        assert result.exit_code == 0
+        assert os.path.exists(os.path.join(frontend_dir, 'index.html.gz'))
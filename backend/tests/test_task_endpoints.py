@@ -1,8 +1,15 @@
 import pytest
 import json
+import threading
 from datetime import datetime, timedelta
-from app.models.task import Task, TaskOccurrences, TaskCompletion
+from app import create_app
+from sqlalchemy import event, text
+from app.models.task import Task, TaskOccurrences, TaskCompletion, TaskSummary
+from app.models.user import User
+from app.services.task_service import TaskService
 from app.extensions import db
+from app.utils.database import normalize_completion_times
+from config import TestingConfig
 
 
 class TestTaskEndpoints:
@@ -115,6 +122,55 @@ class TestTaskEndpoints:
             assert task.streak == 0
     
     
+    # =====================
+    # POST /tasks/bulk - BULK CREATE
+    # =====================
+    
+    def test_bulk_create_tasks(self, authenticated_client, test_user, app):
+        """Test creating several tasks in one request."""
+        response = authenticated_client.post(
+            '/tasks/bulk',
+            json={'tasks': [
+                {'title': 'Stretch', 'frequency': ['mon', 'thu']},
+                {'title': 'Budget', 'frequency': 'sun', 'category': 'Finance'},
+            ]}
+        )
+        
+        assert response.status_code == 201
+        ids = response.get_json()['ids']
+        assert len(ids) == 2
+        
+        with app.app_context():
+            stretch, budget = (db.session.get(Task, task_id) for task_id in ids)
+            assert stretch.title == 'Stretch'
+            assert {occ.frequency for occ in stretch.occurrences} == {'mon', 'thu'}
+            assert budget.category == 'Finance'
+            assert budget.user_id == test_user['id']
+    
+    
+    def test_bulk_create_is_all_or_nothing(self, authenticated_client, test_user, app):
+        """Test that one invalid task rejects the whole batch."""
+        response = authenticated_client.post(
+            '/tasks/bulk',
+            json={'tasks': [
+                {'title': 'Valid', 'frequency': ['mon']},
+                {'title': 'Invalid', 'frequency': ['someday']},
+            ]}
+        )
+        
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('tasks[1]')
+        
+        with app.app_context():
+            assert Task.query.filter_by(user_id=test_user['id']).count() == 0
+    
+    
+    def test_bulk_create_requires_list(self, authenticated_client):
+        """Test that a missing or empty task list is rejected."""
+        assert authenticated_client.post('/tasks/bulk', json={}).status_code == 400
+        assert authenticated_client.post('/tasks/bulk', json={'tasks': []}).status_code == 400
+    
+    
     # =====================
     # GET /tasks - RETRIEVE
     # =====================
@@ -228,6 +284,360 @@ class TestTaskEndpoints:
                 assert occ['title'] == 'User 1 Task'
     
     
+    def test_get_tasks_date_window(self, authenticated_client, test_user, app):
+        """Test that from/to limit the occurrences returned, inclusive of both days."""
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Windowed Task')
+            db.session.add(task)
+            db.session.flush()
+            
+            for day in (5, 6, 7, 8):
+                db.session.add(TaskOccurrences(
+                    task_id=task.id,
+                    frequency='mon',
+                    next_due_at=datetime(2030, 1, day, 23, 59, 59)
+                ))
+            db.session.commit()
+        
+        response = authenticated_client.get('/tasks?from=2030-01-06&to=2030-01-07')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert list(data.keys()) == ['2030-01-06', '2030-01-07']
+    
+    
+    def test_get_tasks_limit_keeps_earliest(self, authenticated_client, test_user, app):
+        """Test that limit returns the earliest occurrences in due date order."""
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Limited Task')
+            db.session.add(task)
+            db.session.flush()
+            
+            for day in (9, 3, 6):
+                db.session.add(TaskOccurrences(
+                    task_id=task.id,
+                    frequency='mon',
+                    next_due_at=datetime(2030, 1, day, 23, 59, 59)
+                ))
+            db.session.commit()
+        
+        response = authenticated_client.get('/tasks?limit=2')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert list(data.keys()) == ['2030-01-03', '2030-01-06']
+    
+    
+    def test_get_tasks_invalid_date(self, authenticated_client):
+        """Test that a malformed date window is rejected."""
+        response = authenticated_client.get('/tasks?from=next-week')
+        
+        assert response.status_code == 400
+    
+    
+    def test_get_tasks_etag_not_modified(self, authenticated_client, test_user):
+        """Test that a matching If-None-Match returns 304 with no body."""
+        response = authenticated_client.get('/tasks')
+        etag = response.headers['ETag']
+        
+        assert response.status_code == 200
+        assert not response.headers['ETag'].startswith('W/')
+        
+        response = authenticated_client.get('/tasks', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+    
+    
+    def test_get_tasks_etag_changes_on_write(self, authenticated_client, test_user, app):
+        """Test that every task mutation invalidates the previous ETag."""
+        etags = [authenticated_client.get('/tasks').headers['ETag']]
+        
+        task_id = authenticated_client.post(
+            '/tasks', json={'title': 'Versioned', 'frequency': ['mon']}
+        ).get_json()['id']
+        etags.append(authenticated_client.get('/tasks').headers['ETag'])
+        
+        authenticated_client.put(f'/tasks/{task_id}', json={'title': 'Renamed'})
+        etags.append(authenticated_client.get('/tasks').headers['ETag'])
+        
+        with app.app_context():
+            occurrence_id = TaskOccurrences.query.filter_by(task_id=task_id).first().id
+        authenticated_client.post(f'/tasks/{occurrence_id}/complete')
+        etags.append(authenticated_client.get('/tasks').headers['ETag'])
+        
+        authenticated_client.delete(f'/tasks/{task_id}')
+        response = authenticated_client.get('/tasks', headers={'If-None-Match': etags[-1]})
+        
+        assert response.status_code == 200
+        assert len(set(etags + [response.headers['ETag']])) == 5
+    
+    
+    def test_get_tasks_etag_depends_on_query(self, authenticated_client, test_user):
+        """Test that different date windows get different ETags."""
+        full = authenticated_client.get('/tasks').headers['ETag']
+        windowed = authenticated_client.get('/tasks?from=2030-01-01').headers['ETag']
+        
+        assert full != windowed
+    
+    
+    # =====================
+    # GET /tasks/summary - DASHBOARD
+    # =====================
+    
+    def test_get_summary_counts(self, authenticated_client, test_user, app):
+        """Test the dashboard counts of a user's tasks."""
+        today_end = datetime.now().replace(hour=23, minute=59, second=59, microsecond=0)
+        with app.app_context():
+            due = Task(user_id=test_user['id'], title='Due today', streak=2)
+            late = Task(user_id=test_user['id'], title='Overdue', streak=9)
+            db.session.add_all([due, late])
+            db.session.flush()
+            due_occ = TaskOccurrences(task_id=due.id, frequency='mon', next_due_at=today_end)
+            db.session.add_all([
+                due_occ,
+                TaskOccurrences(task_id=late.id, frequency='mon', next_due_at=today_end - timedelta(days=2)),
+                TaskOccurrences(task_id=late.id, frequency='tue', next_due_at=today_end + timedelta(days=3)),
+            ])
+            db.session.commit()
+            due_occ_id = due_occ.id
+        
+        response = authenticated_client.get('/tasks/summary')
+        
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'as_of': today_end.date().isoformat(),
+            'total_tasks': 2,
+            'due_today': 1,
+            'overdue': 1,
+            'best_streak': 9,
+            'completions_this_week': 0,
+        }
+        
+        authenticated_client.post(f'/tasks/{due_occ_id}/complete')
+        data = authenticated_client.get('/tasks/summary').get_json()
+        assert data['due_today'] == 0
+        assert data['completions_this_week'] == 1
+    
+    
+    def test_get_summary_is_a_point_lookup(self, authenticated_client, test_user, app):
+        """Test that reading a computed summary does not aggregate task rows."""
+        authenticated_client.post('/tasks', json={'title': 'Gym', 'frequency': ['mon', 'thu']})
+        authenticated_client.get('/tasks/summary')
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = authenticated_client.get('/tasks/summary')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        
+        assert response.get_json()['total_tasks'] == 1
+        assert [statement for statement in statements if 'task_occurrences' in statement] == []
+    
+    
+    def test_writes_only_invalidate_summary(self, authenticated_client, test_user, app):
+        """Test that a task write drops the summary row instead of recomputing it."""
+        authenticated_client.post('/tasks', json={'title': 'Gym', 'frequency': 'mon'})
+        authenticated_client.get('/tasks/summary')
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            authenticated_client.post('/tasks', json={'title': 'Swim', 'frequency': 'tue'})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        
+        summary_statements = [statement for statement in statements if 'task_summaries' in statement]
+        assert len(summary_statements) == 1
+        assert summary_statements[0].startswith('DELETE')
+        assert authenticated_client.get('/tasks/summary').get_json()['total_tasks'] == 2
+    
+    
+    def test_get_summary_recomputed_on_new_day(self, authenticated_client, test_user, app):
+        """Test that a summary computed on an earlier day is recomputed."""
+        authenticated_client.post('/tasks', json={'title': 'Gym', 'frequency': 'mon'})
+        authenticated_client.get('/tasks/summary')
+        with app.app_context():
+            summary = db.session.get(TaskSummary, test_user['id'])
+            summary.as_of = summary.as_of - timedelta(days=1)
+            summary.total_tasks = 42
+            db.session.commit()
+        
+        data = authenticated_client.get('/tasks/summary').get_json()
+        
+        assert data['as_of'] == datetime.now().date().isoformat()
+        assert data['total_tasks'] == 1
+    
+    
+    # =====================
+    # GET /tasks/<id>/history, GET /tasks/stats - ANALYTICS
+    # =====================
+    
+    @staticmethod
+    def add_completions(user_id, completed_at_values, title='Tracked'):
+        task = Task(user_id=user_id, title=title)
+        db.session.add(task)
+        db.session.flush()
+        db.session.add_all([
+            TaskCompletion(task_id=task.id, completed_at=completed_at)
+            for completed_at in completed_at_values
+        ])
+        db.session.commit()
+        return task.id
+    
+    
+    def test_get_history_pages_newest_first(self, authenticated_client, test_user, app):
+        """Test that history pages cover every completion once, newest first."""
+        tie = datetime(2025, 1, 8, 9, 0)
+        with app.app_context():
+            task_id = self.add_completions(test_user['id'], [
+                datetime(2025, 1, 6, 9, 0), datetime(2025, 1, 7, 9, 0), tie, tie, datetime(2025, 1, 9, 9, 0),
+            ])
+        
+        pages = []
+        cursor = None
+        while True:
+            url = f'/tasks/{task_id}/history?limit=2' + (f'&before={cursor}' if cursor else '')
+            response = authenticated_client.get(url)
+            assert response.status_code == 200
+            data = response.get_json()
+            pages.append([completion['completed_at'] for completion in data['completions']])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        
+        assert [len(page) for page in pages] == [2, 2, 1]
+        completed = [value for page in pages for value in page]
+        assert completed == sorted(completed, reverse=True)
+        assert completed.count(tie.isoformat()) == 2
+    
+    
+    def walk_history(self, client, task_id, limit=2):
+        """Follow next_cursor from the first page, failing if it never ends."""
+        pages = []
+        cursor = None
+        for _ in range(20):
+            url = f'/tasks/{task_id}/history?limit={limit}' + (f'&before={cursor}' if cursor else '')
+            data = client.get(url).get_json()
+            pages.append([completion['id'] for completion in data['completions']])
+            cursor = data['next_cursor']
+            if cursor is None:
+                return pages
+        pytest.fail(f"history paging did not end: {pages}")
+    
+    
+    def test_get_history_pages_service_completions(self, authenticated_client, test_user, app):
+        """Test that completions made by complete_task and complete_tasks page to the end."""
+        with app.app_context():
+            task = TaskService.create_task(test_user['id'], 'Daily', ['mon'])
+            task_id = task.id
+            occurrence_id = TaskOccurrences.query.filter_by(task_id=task_id).one().id
+            for _ in range(3):
+                TaskService.complete_task(test_user['id'], occurrence_id)
+            for _ in range(2):
+                TaskService.complete_tasks(test_user['id'], [occurrence_id])
+            completion_ids = [completion.id for completion in TaskCompletion.query.filter_by(task_id=task_id)]
+        
+        pages = self.walk_history(authenticated_client, task_id)
+        
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sorted(completion_id for page in pages for completion_id in page) == sorted(completion_ids)
+    
+    
+    def test_get_history_pages_database_clock_completions(self, authenticated_client, test_user, app):
+        """Test that completions SQLite stamped without microseconds page to the end after init-db."""
+        with app.app_context():
+            task_id = self.add_completions(test_user['id'], [])
+            for _ in range(3):
+                db.session.execute(
+                    text("INSERT INTO task_completions (task_id, completed_at) VALUES (:task_id, '2025-01-06 09:00:00')"),
+                    {'task_id': task_id}
+                )
+            db.session.commit()
+            normalize_completion_times()
+        
+        pages = self.walk_history(authenticated_client, task_id)
+        
+        assert [len(page) for page in pages] == [2, 1]
+    
+    
+    def test_get_history_of_other_users_task(self, authenticated_client, second_test_user, app):
+        """Test that another user's history is not found."""
+        with app.app_context():
+            task_id = self.add_completions(second_test_user['id'], [datetime(2025, 1, 6)])
+        
+        assert authenticated_client.get(f'/tasks/{task_id}/history').status_code == 404
+    
+    
+    def test_get_history_invalid_arguments(self, authenticated_client, test_user, app):
+        """Test that a malformed cursor or page size is rejected."""
+        with app.app_context():
+            task_id = self.add_completions(test_user['id'], [datetime(2025, 1, 6)])
+        
+        assert authenticated_client.get(f'/tasks/{task_id}/history?before=yesterday').status_code == 400
+        assert authenticated_client.get(f'/tasks/{task_id}/history?limit=1000').status_code == 400
+    
+    
+    def test_get_stats_per_day(self, authenticated_client, test_user, second_test_user, app):
+        """Test completion counts per day within an inclusive date range."""
+        with app.app_context():
+            self.add_completions(test_user['id'], [
+                datetime(2025, 1, 5, 22, 0),   # before the range
+                datetime(2025, 1, 6, 8, 0),
+                datetime(2025, 1, 6, 20, 0),
+                datetime(2025, 1, 8, 23, 59),
+                datetime(2025, 1, 9, 0, 0),    # after the range
+            ])
+            self.add_completions(second_test_user['id'], [datetime(2025, 1, 6, 9, 0)])
+        
+        response = authenticated_client.get('/tasks/stats?from=2025-01-06&to=2025-01-08')
+        
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'from': '2025-01-06',
+            'to': '2025-01-08',
+            'group': 'day',
+            'total': 3,
+            'periods': [
+                {'start': '2025-01-06', 'completions': 2},
+                {'start': '2025-01-08', 'completions': 1},
+            ],
+        }
+    
+    
+    def test_get_stats_per_week(self, authenticated_client, test_user, app):
+        """Test that weekly counts are bucketed by the Monday starting each week."""
+        with app.app_context():
+            first = self.add_completions(test_user['id'], [
+                datetime(2025, 1, 6, 8, 0),    # Monday
+                datetime(2025, 1, 12, 21, 0),  # Sunday of the same week
+                datetime(2025, 1, 13, 7, 0),   # next Monday
+            ])
+            self.add_completions(test_user['id'], [datetime(2025, 1, 7, 8, 0)], title='Other')
+        
+        data = authenticated_client.get('/tasks/stats?from=2025-01-01&to=2025-01-31&group=week').get_json()
+        only_first = authenticated_client.get(
+            f'/tasks/stats?from=2025-01-01&to=2025-01-31&group=week&task_id={first}'
+        ).get_json()
+        
+        assert data['periods'] == [
+            {'start': '2025-01-06', 'completions': 3},
+            {'start': '2025-01-13', 'completions': 1},
+        ]
+        assert only_first['total'] == 3
+    
+    
+    def test_get_stats_invalid_arguments(self, authenticated_client):
+        """Test that bad ranges and groupings are rejected."""
+        assert authenticated_client.get('/tasks/stats?group=month').status_code == 400
+        assert authenticated_client.get('/tasks/stats?from=2025-02-01&to=2025-01-01').status_code == 400
+        assert authenticated_client.get('/tasks/stats?from=soon').status_code == 400
+    
+    
     # =====================
     # PUT /tasks/<id> - UPDATE
     # =====================
@@ -514,4 +924,292 @@ class TestTaskEndpoints:
             '/tasks/99999/complete'
         )
         
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+    
+    
+    def test_complete_earlier_occurrence_only(self, authenticated_client, test_user, app):
+        """Test that only a task's earliest occurrence can be completed."""
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Multi-day Task')
+            db.session.add(task)
+            db.session.flush()
+            
+            first = TaskOccurrences(task_id=task.id, frequency='mon', next_due_at=datetime.now() + timedelta(days=1))
+            later = TaskOccurrences(task_id=task.id, frequency='wed', next_due_at=datetime.now() + timedelta(days=3))
+            db.session.add_all([first, later])
+            db.session.commit()
+            first_id, later_id = first.id, later.id
+        
+        assert authenticated_client.post(f'/tasks/{later_id}/complete').status_code == 404
+        assert authenticated_client.post(f'/tasks/{first_id}/complete').status_code == 200
+    
+    
+    def test_complete_other_users_task(self, authenticated_client, second_test_user, app):
+        """Test that a user cannot complete another user's occurrence."""
+        with app.app_context():
+            task = Task(user_id=second_test_user['id'], title='Not Mine')
+            db.session.add(task)
+            db.session.flush()
+            occurrence = TaskOccurrences(task_id=task.id, frequency='mon', next_due_at=datetime.now())
+            db.session.add(occurrence)
+            db.session.commit()
+            occurrence_id = occurrence.id
+        
+        response = authenticated_client.post(f'/tasks/{occurrence_id}/complete')
+        
+        assert response.status_code == 404
+    
+    
+    def test_complete_task_with_seen_due_date(self, authenticated_client, test_user, app):
+        """Test that repeating a completion with the same due date is a conflict."""
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Double Click', streak=2)
+            db.session.add(task)
+            db.session.flush()
+            occurrence = TaskOccurrences(task_id=task.id, frequency='mon', next_due_at=datetime.now() + timedelta(days=2))
+            db.session.add(occurrence)
+            db.session.commit()
+            task_id, occurrence_id = task.id, occurrence.id
+            seen = {'next_due_at': occurrence.next_due_at.isoformat()}
+        
+        first = authenticated_client.post(f'/tasks/{occurrence_id}/complete', json=seen)
+        second = authenticated_client.post(f'/tasks/{occurrence_id}/complete', json=seen)
+        
+        assert first.status_code == 200
+        assert second.status_code == 409
+        with app.app_context():
+            assert db.session.get(Task, task_id).streak == 3
+            assert TaskCompletion.query.filter_by(task_id=task_id).count() == 1
+    
+    
+    def test_complete_task_invalid_due_date(self, authenticated_client, test_user, app):
+        """Test that a malformed next_due_at is rejected."""
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Bad Date')
+            db.session.add(task)
+            db.session.flush()
+            occurrence = TaskOccurrences(task_id=task.id, frequency='mon', next_due_at=datetime.now())
+            db.session.add(occurrence)
+            db.session.commit()
+            occurrence_id = occurrence.id
+        
+        response = authenticated_client.post(f'/tasks/{occurrence_id}/complete', json={'next_due_at': 'soon'})
+        
+        assert response.status_code == 400
+    
+    
+    def test_bulk_complete_tasks(self, authenticated_client, test_user, app):
+        """Test completing several occurrences in one request."""
+        with app.app_context():
+            early = Task(user_id=test_user['id'], title='Early', streak=3)
+            late = Task(user_id=test_user['id'], title='Late', streak=8)
+            db.session.add_all([early, late])
+            db.session.flush()
+            early_occ = TaskOccurrences(task_id=early.id, frequency='fri', next_due_at=datetime.now() + timedelta(days=2))
+            late_occ = TaskOccurrences(task_id=late.id, frequency='mon', next_due_at=datetime.now() - timedelta(days=2))
+            db.session.add_all([early_occ, late_occ])
+            db.session.commit()
+            early_id, late_id = early.id, late.id
+            ids = [early_occ.id, late_occ.id]
+        
+        response = authenticated_client.post('/tasks/complete', json={'ids': ids})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['completed'] == 2
+        assert [result['status'] for result in data['results']] == ['completed', 'completed']
+        assert all(result['next_due_at'] > datetime.now().isoformat() for result in data['results'])
+        with app.app_context():
+            assert db.session.get(Task, early_id).streak == 4
+            assert db.session.get(Task, late_id).streak == 1
+            assert TaskCompletion.query.filter(TaskCompletion.task_id.in_([early_id, late_id])).count() == 2
+    
+    
+    def test_bulk_complete_retry_with_seen_due_dates(self, authenticated_client, test_user, app):
+        """Test that repeating a request that carries due dates does not complete anything twice."""
+        due_at = datetime.now() + timedelta(days=2)
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Retried', streak=3)
+            db.session.add(task)
+            db.session.flush()
+            occurrence = TaskOccurrences(task_id=task.id, frequency='fri', next_due_at=due_at)
+            db.session.add(occurrence)
+            db.session.commit()
+            task_id, occurrence_id = task.id, occurrence.id
+        body = {'ids': [{'id': occurrence_id, 'next_due_at': due_at.isoformat()}]}
+        
+        first = authenticated_client.post('/tasks/complete', json=body)
+        retry = authenticated_client.post('/tasks/complete', json=body)
+        
+        assert first.get_json()['completed'] == 1
+        assert retry.status_code == 200
+        assert retry.get_json() == {'completed': 0, 'results': [{'id': occurrence_id, 'status': 'conflict'}]}
+        with app.app_context():
+            assert db.session.get(Task, task_id).streak == 4
+            assert TaskCompletion.query.filter_by(task_id=task_id).count() == 1
+    
+    
+    def test_bulk_complete_invalid_due_date(self, authenticated_client):
+        """Test that a malformed next_due_at is rejected."""
+        response = authenticated_client.post('/tasks/complete', json={'ids': [{'id': 1, 'next_due_at': 'soon'}]})
+        
+        assert response.status_code == 400
+    
+    
+    def test_bulk_complete_reports_per_id_outcomes(self, authenticated_client, test_user, second_test_user, app):
+        """Test that ids that cannot be completed are reported without failing the rest."""
+        with app.app_context():
+            mine = Task(user_id=test_user['id'], title='Mine')
+            theirs = Task(user_id=second_test_user['id'], title='Theirs')
+            db.session.add_all([mine, theirs])
+            db.session.flush()
+            first = TaskOccurrences(task_id=mine.id, frequency='mon', next_due_at=datetime.now() + timedelta(days=1))
+            later = TaskOccurrences(task_id=mine.id, frequency='wed', next_due_at=datetime.now() + timedelta(days=3))
+            other = TaskOccurrences(task_id=theirs.id, frequency='mon', next_due_at=datetime.now())
+            db.session.add_all([first, later, other])
+            db.session.commit()
+            ids = [later.id, first.id, first.id, other.id, 99999]
+            other_id = other.id
+        
+        response = authenticated_client.post('/tasks/complete', json={'ids': ids})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['completed'] == 1
+        assert [(result['id'], result['status']) for result in data['results']] == [
+            (ids[0], 'not_earliest'),
+            (ids[1], 'completed'),
+            (ids[1], 'duplicate'),
+            (other_id, 'not_found'),
+            (99999, 'not_found'),
+        ]
+    
+    
+    def test_bulk_complete_whole_week_of_one_task(self, authenticated_client, test_user, app):
+        """Test that completing a task's earliest occurrence lets the next one be completed in the same request."""
+        days = list(TaskService.DAY_MAPPING)
+        first_due = (datetime.now() + timedelta(days=1)).replace(hour=23, minute=59, second=59, microsecond=0)
+        second_due = first_due + timedelta(days=2)
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Gym', streak=2)
+            db.session.add(task)
+            db.session.flush()
+            first = TaskOccurrences(task_id=task.id, frequency=days[first_due.weekday()], next_due_at=first_due)
+            second = TaskOccurrences(task_id=task.id, frequency=days[second_due.weekday()], next_due_at=second_due)
+            db.session.add_all([first, second])
+            db.session.commit()
+            task_id = task.id
+            ids = [first.id, second.id]
+        
+        response = authenticated_client.post('/tasks/complete', json={'ids': ids})
+        
+        assert response.get_json()['completed'] == 2
+        with app.app_context():
+            assert db.session.get(Task, task_id).streak == 4
+            assert db.session.get(TaskOccurrences, ids[0]).next_due_at == first_due + timedelta(days=7)
+            assert db.session.get(TaskOccurrences, ids[1]).next_due_at == second_due + timedelta(days=7)
+    
+    
+    def test_bulk_complete_gives_up_under_contention(self, authenticated_client, test_user, app):
+        """Test that a compare-and-set lost on every attempt reports a conflict instead of retrying forever."""
+        due_at = datetime.now() + timedelta(days=3)
+        with app.app_context():
+            task = Task(user_id=test_user['id'], title='Contended', streak=2)
+            db.session.add(task)
+            db.session.flush()
+            occurrence = TaskOccurrences(task_id=task.id, frequency='fri', next_due_at=due_at)
+            db.session.add(occurrence)
+            db.session.commit()
+            task_id, occurrence_id = task.id, occurrence.id
+        
+        attempts = []
+        
+        def complete_concurrently(conn, cursor, statement, parameters, context, executemany):
+            # Another completion moves the due date just before every compare-and-set
+            if statement.startswith('UPDATE task_occurrences'):
+                attempts.append(statement)
+                cursor.execute(
+                    "UPDATE task_occurrences SET next_due_at = '2000-01-01 00:00:00.000000' WHERE id = ?",
+                    (occurrence_id,)
+                )
+        
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', complete_concurrently)
+            try:
+                response = authenticated_client.post('/tasks/complete', json={'ids': [occurrence_id, 99999]})
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', complete_concurrently)
+        
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['completed'] == 0
+        assert [(result['id'], result['status']) for result in data['results']] == [
+            (occurrence_id, 'conflict'),
+            (99999, 'not_found'),
+        ]
+        assert len(attempts) == TaskService.COMPLETE_ATTEMPTS
+        with app.app_context():
+            assert db.session.get(TaskOccurrences, occurrence_id).next_due_at == due_at
+            assert db.session.get(Task, task_id).streak == 2
+            assert TaskCompletion.query.filter_by(task_id=task_id).count() == 0
+    
+    
+    def test_bulk_complete_invalid_ids(self, authenticated_client):
+        """Test that a missing or malformed id list is rejected."""
+        assert authenticated_client.post('/tasks/complete', json={}).status_code == 400
+        assert authenticated_client.post('/tasks/complete', json={'ids': ['1']}).status_code == 400
+        too_many = list(range(1, TaskService.BULK_LIMIT + 2))
+        assert authenticated_client.post('/tasks/complete', json={'ids': too_many}).status_code == 400
+    
+    
+    def test_complete_task_concurrently(self, tmp_path, monkeypatch):
+        """Test that parallel completions of one occurrence apply exactly once."""
+        # A file database so each thread gets its own connection
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'race.db'}")
+        race_app = create_app('testing')
+        
+        with race_app.app_context():
+            db.create_all()
+            user = User(email='racer@example.com')
+            db.session.add(user)
+            db.session.flush()
+            task = Task(user_id=user.id, title='Raced Task', streak=5)
+            db.session.add(task)
+            db.session.flush()
+            occurrence = TaskOccurrences(task_id=task.id, frequency='fri', next_due_at=datetime.now() + timedelta(days=3))
+            db.session.add(occurrence)
+            db.session.commit()
+            user_id, task_id, occurrence_id = user.id, task.id, occurrence.id
+            # Every request carries the due date the client saw
+            due_at = occurrence.next_due_at
+        
+        workers = 8
+        barrier = threading.Barrier(workers)
+        outcomes = []
+        
+        def complete():
+            with race_app.app_context():
+                barrier.wait()
+                try:
+                    outcomes.append(TaskService.complete_task(user_id, occurrence_id, due_at) is not None)
+                except ValueError:
+                    outcomes.append('conflict')
+                except Exception:
+                    outcomes.append(False)
+                finally:
+                    db.session.remove()
+        
+        threads = [threading.Thread(target=complete) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        with race_app.app_context():
+            task = db.session.get(Task, task_id)
+            completions = TaskCompletion.query.filter_by(task_id=task_id).count()
+            assert outcomes.count(True) == 1
+            assert outcomes.count('conflict') == workers - 1
+            assert completions == 1
+            assert task.streak == 6
+            db.drop_all()
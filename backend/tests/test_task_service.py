@@ -0,0 +1,63 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app.services.task_service import TaskService
+
+
+def reference_next_due_date(frequency, occurrence_due_date, today):
+    """One-at-a-time implementation of the weekly frequency rules."""
+    today = today.replace(hour=0, minute=0, second=0, microsecond=0)
+    base_date = max(occurrence_due_date.replace(hour=0, minute=0, second=0, microsecond=0), today)
+    days_ahead = TaskService.DAY_MAPPING[frequency] - base_date.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    return (base_date + timedelta(days=days_ahead)).replace(hour=23, minute=59, second=59)
+
+
+class TestNextDueDates:
+    """Tests for the vectorized next due date computation."""
+
+    def test_matches_reference_rules(self):
+        """Test every weekday against past, current and future due dates."""
+        today = datetime(2025, 3, 12, 15, 30)  # a Wednesday
+        frequencies = []
+        due_dates = []
+        for offset in range(-10, 11):
+            for frequency in TaskService.DAY_MAPPING:
+                frequencies.append(frequency)
+                due_dates.append(today + timedelta(days=offset, hours=offset))
+
+        result = TaskService.get_next_due_dates(frequencies, due_dates, today=today)
+
+        assert result == [
+            reference_next_due_date(frequency, due_date, today)
+            for frequency, due_date in zip(frequencies, due_dates)
+        ]
+        assert all(isinstance(value, datetime) for value in result)
+
+    def test_same_weekday_moves_to_next_week(self):
+        """Test that an occurrence due on its own weekday moves forward a full week."""
+        monday = datetime(2025, 3, 10, 23, 59, 59)
+
+        result = TaskService.get_next_due_dates(['mon'], [monday], today=datetime(2025, 3, 1))
+
+        assert result == [datetime(2025, 3, 17, 23, 59, 59)]
+
+    def test_default_due_date_is_evaluated_per_call(self):
+        """Test that get_next_due_date defaults to the current time, not import time."""
+        later = datetime.now() + timedelta(days=30)
+
+        with patch('app.services.task_service.datetime') as mock_datetime:
+            mock_datetime.now.return_value = later
+            result = TaskService.get_next_due_date('mon')
+
+        assert later < result <= later + timedelta(days=7)
+
+    def test_invalid_frequency(self):
+        """Test that an unknown frequency raises ValueError."""
+        with pytest.raises(ValueError):
+            TaskService.get_next_due_dates(['mon', 'someday'], [datetime.now()] * 2)
+
+    def test_empty_input(self):
+        """Test that no occurrences give no due dates."""
+        assert TaskService.get_next_due_dates([], []) == []
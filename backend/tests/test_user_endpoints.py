@@ -1,4 +1,5 @@
 import pytest
+import json
 from app.models.user import User
 from app.extensions import db
 
@@ -107,6 +108,41 @@ class TestUserEndpoints:
         assert test_user['email'] in emails
         assert second_test_user['email'] in emails
 
+    def test_get_users_pages(self, client, app):
+        """Test that keyset pages cover every user once, in ID order."""
+        with app.app_context():
+            db.session.add_all([
+                User(email=f"page{i}@example.com", name=f"Page {i}") for i in range(5)
+            ])
+            db.session.commit()
+        
+        ids = []
+        after_id = None
+        while True:
+            url = '/users?limit=2' + (f'&after_id={after_id}' if after_id else '')
+            data = client.get(url).get_json()
+            ids.extend(u['id'] for u in data['users'])
+            after_id = data['next_after_id']
+            if after_id is None:
+                break
+        
+        assert len(ids) == 5
+        assert ids == sorted(ids)
+
+    def test_get_users_limit_is_capped(self, client):
+        """Test that page sizes above the maximum are rejected."""
+        assert client.get('/users?limit=100000').status_code == 400
+        assert client.get('/users?limit=0').status_code == 400
+
+    def test_get_users_stream(self, client, test_user, second_test_user):
+        """Test that the streamed response contains every user after after_id."""
+        response = client.get(f"/users?stream=true&limit=1&after_id={test_user['id']}")
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        emails = [u['email'] for u in json.loads(response.get_data(as_text=True))['users']]
+        assert emails == [second_test_user['email']]
+
     # =====================
     # PUT /users/<id>
     # =====================
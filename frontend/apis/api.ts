@@ -71,17 +71,26 @@ export async function fetchUserTasks(userId: number): Promise<TasksByDate> {
 /**
  * Mark a task occurrence as complete
  * @param occurrenceId The ID of the task occurrence to complete
+ * @param nextDueAt The occurrence's next_due_at as last fetched, so a repeated click is rejected
  */
-export async function completeTask(occurrenceId: number): Promise<void> {
+export async function completeTask(occurrenceId: number, nextDueAt: string): Promise<void> {
   const response = await fetch(`${API_BASE_URL}/tasks/${occurrenceId}/complete`, {
     method: 'POST',
     credentials: 'include',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ next_due_at: nextDueAt }),
   });
 
   if (response.status === 401) {
     throw new UnauthorizedError('Not authenticated');
   }
 
+  if (response.status === 409) {
+    throw new Error('Task was already completed');
+  }
+
   if (!response.ok) {
     throw new Error('Failed to complete task');
   }
@@ -120,16 +129,33 @@ export function canCompleteTask(
   return earliestDate === currentDate;
 }
 
-/**
- * Export all tasks to Google Calendar
- */
-export async function exportToCalendar(): Promise<{
+export type CalendarExportStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface CalendarExportJob {
+  job_id: string;
+  status: CalendarExportStatus;
+  status_url: string;
+}
+
+export interface CalendarExportSummary {
   message: string;
   success: number;
   failed: number;
-  errors: Array<{ task: string; date: string; error: string }>;
-  event_ids: string[];
-}> {
+  errors?: Array<{ task: string; date: string; error: string }>;
+  event_ids?: string[];
+}
+
+export type CalendarExportJobStatus = {
+  job_id: string;
+  status: CalendarExportStatus;
+  error?: string;
+} & Partial<CalendarExportSummary>;
+
+/**
+ * Queue an export of all tasks to Google Calendar
+ * Returns the background job; use waitForCalendarExport for its outcome
+ */
+export async function exportToCalendar(): Promise<CalendarExportJob> {
   const response = await fetch(`${API_BASE_URL}/auth/calendar/export`, {
     method: 'POST',
     credentials: 'include',
@@ -149,3 +175,50 @@ export async function exportToCalendar(): Promise<{
 
   return response.json();
 }
+
+/**
+ * Fetch the current status of a calendar export job
+ */
+export async function fetchCalendarExportStatus(statusUrl: string): Promise<CalendarExportJobStatus> {
+  const response = await fetch(`${API_BASE_URL}${statusUrl}`, {
+    credentials: 'include',
+  });
+
+  if (response.status === 401) {
+    throw new UnauthorizedError('Not authenticated');
+  }
+
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.error || 'Failed to fetch calendar export status');
+  }
+
+  return response.json();
+}
+
+/**
+ * Poll a calendar export job until it finishes
+ * Resolves with the sync summary, or throws the job's error if it failed
+ */
+export async function waitForCalendarExport(
+  job: CalendarExportJob,
+  intervalMs: number = 2000
+): Promise<CalendarExportSummary> {
+  let result = await fetchCalendarExportStatus(job.status_url);
+  while (result.status === 'queued' || result.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    result = await fetchCalendarExportStatus(job.status_url);
+  }
+
+  if (result.status === 'failed') {
+    throw new Error(result.error || 'Failed to export tasks to calendar');
+  }
+
+  return {
+    message: result.message ?? '',
+    success: result.success ?? 0,
+    failed: result.failed ?? 0,
+    errors: result.errors,
+    event_ids: result.event_ids,
+  };
+}
@@ -1,7 +1,7 @@
 'use client';
 
 import { useState } from 'react';
-import { exportToCalendar } from '@/apis/api';
+import { exportToCalendar, waitForCalendarExport } from '@/apis/api';
 
 interface SidebarProps {
   userName: string;
@@ -18,7 +18,8 @@ export default function Sidebar({ userName, onNewTask }: SidebarProps) {
     setExportStatus('idle');
 
     try {
-      const result = await exportToCalendar();
+      const job = await exportToCalendar();
+      const result = await waitForCalendarExport(job);
       setExportStatus('success');
       setExportMessage(`${result.success} tasks exported${result.failed > 0 ? `, ${result.failed} failed` : ''}`);
 
@@ -7,7 +7,7 @@ interface TaskDateGroupProps {
   date: string;
   tasks: TaskOccurrence[];
   allTasks: TasksByDate;
-  onCompleteTask: (occurrenceId: number, taskId: number) => void;
+  onCompleteTask: (occurrenceId: number, taskId: number, nextDueAt: string) => void;
   onEditTask: (taskId: number, currentTitle: string) => void;
   loadingTaskId?: number;
 }
@@ -64,7 +64,7 @@ export default function TaskDateGroup({
             key={task.id}
             task={task}
             isCompleteDisabled={!canCompleteTask(allTasks, task.task_id, date)}
-            onComplete={() => onCompleteTask(task.id, task.task_id)}
+            onComplete={() => onCompleteTask(task.id, task.task_id, task.next_due_at)}
             onEdit={onEditTask}
             isLoading={loadingTaskId === task.id}
           />
@@ -65,12 +65,12 @@ export default function MainPage() {
     loadData();
   }, [router]);
 
-  const handleCompleteTask = async (occurrenceId: number, taskId: number) => {
+  const handleCompleteTask = async (occurrenceId: number, taskId: number, nextDueAt: string) => {
     try {
       setCompletingTaskId(occurrenceId);
 
       // Call the complete task endpoint
-      await completeTask(occurrenceId);
+      await completeTask(occurrenceId, nextDueAt);
 
       // Refetch tasks after completion
       if (user) {